@@ -0,0 +1,87 @@
+import asyncio
+from datetime import date
+from typing import List, Optional
+
+from app.task import Task
+from app.task_manager import TaskManager
+
+
+class AsyncTaskManager:
+    """Асинхронный интерфейс к задачам для работы внутри цикла событий asyncio.
+    Изменения применяются в памяти сразу, а запись на диск выполняется в отдельном потоке.
+    Одновременно ожидающие вызовы разделяют одну текущую запись"""
+
+    # Режимы TaskManager, несовместимые с асинхронным интерфейсом: совместный доступ записывает изменения
+    # под блокировкой файла прямо в вызывающем потоке, ленивый режим читает хранилище при каждом запросе,
+    # а при отложенной записи flush() не дожидается записи на диск
+    UNSUPPORTED = ("shared", "lazy", "write_behind")
+
+    def __init__(self, manager: TaskManager):
+        if manager.shared or manager._writer is not None or not manager._loaded:
+            raise ValueError(f"Асинхронный интерфейс не поддерживает режимы {', '.join(self.UNSUPPORTED)}")
+        self.manager = manager
+        self._saving: Optional[asyncio.Future] = None
+
+    @classmethod
+    async def open(cls, filename: str, **options) -> "AsyncTaskManager":
+        """Загружает задачи из файла, не блокируя цикл событий"""
+        unsupported = [option for option in cls.UNSUPPORTED if options.get(option)]
+        if unsupported:
+            raise ValueError(f"Асинхронный интерфейс не поддерживает режимы {', '.join(unsupported)}")
+        manager = await asyncio.to_thread(TaskManager, filename, thread_safe=True, verbose=False,
+                                          autoflush=False, **options)
+        return cls(manager)
+
+    async def add(self, title: str, description: str, category: str, due_date: str, priority: str) -> Task:
+        """Добавляет задачу и возвращает ее после сохранения"""
+        task = self.manager.add_task(title, description, category, due_date, priority)
+        await self.save()
+        return task
+
+    async def get(self, task_id: int) -> Optional[Task]:
+        """Возвращает задачу по ID"""
+        return self.manager.get_task(task_id)
+
+    async def edit(self, task_id: int, **fields) -> Optional[Task]:
+        """Редактирует задачу и возвращает ее, если задача найдена"""
+        task = self.manager.edit_task(task_id, **fields)
+        await self.save()
+        return task
+
+    async def complete(self, task_id: int) -> Optional[Task]:
+        """Отмечает задачу как выполненную и возвращает ее, если задача найдена"""
+        task = self.manager.update_status(task_id)
+        await self.save()
+        return task
+
+    async def delete(self, task_id: Optional[int] = None, category: Optional[str] = None) -> List[Task]:
+        """Удаляет задачи по ID или категории и возвращает удаленные задачи"""
+        tasks = self.manager.delete_tasks(task_id, category)
+        await self.save()
+        return tasks
+
+    async def query(self, keyword: Optional[str] = None, category: Optional[str] = None,
+                    status: Optional[str] = None, priority: Optional[str] = None,
+                    due_before: Optional[date] = None, due_after: Optional[date] = None) -> List[Task]:
+        """Возвращает задачи, удовлетворяющие всем заданным условиям"""
+        return self.manager.query(keyword, category, status, priority, due_before, due_after)
+
+    async def save(self) -> None:
+        """Дожидается записи изменений на диск. Вызовы, пришедшие до начала записи,
+        ожидают ее вместе, а изменения после начала записи попадут в следующую"""
+        if self._saving is None:
+            self._saving = asyncio.ensure_future(self._save())
+        # Отмена одного из ожидающих не прерывает запись для остальных
+        await asyncio.shield(self._saving)
+
+    async def _save(self) -> None:
+        # Уступаем цикл событий, чтобы к записи успели присоединиться другие вызовы
+        await asyncio.sleep(0)
+        self._saving = None
+        await asyncio.to_thread(self.manager.flush)
+
+    async def close(self) -> None:
+        """Записывает оставшиеся изменения и закрывает хранилище"""
+        if self._saving is not None:
+            await asyncio.shield(self._saving)
+        await asyncio.to_thread(self.manager.close)
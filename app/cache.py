@@ -0,0 +1,66 @@
+import threading
+from collections import OrderedDict
+from typing import Hashable, List, NamedTuple, Optional, Tuple
+
+
+class CacheInfo(NamedTuple):
+    """Статистика кэша результатов запросов"""
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class QueryCache:
+    """LRU-кэш результатов запросов с проверкой поколения данных.
+    Каждое изменение задач увеличивает поколение хранилища, поэтому запись кэша либо
+    относится к текущему поколению и заведомо актуальна, либо отбрасывается при обращении"""
+
+    def __init__(self, maxsize: int = 128, max_items: int = 100000):
+        self.maxsize = maxsize
+        # Ограничение суммарного числа задач во всех закэшированных результатах
+        self.max_items = max_items
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, Tuple[int, List]]" = OrderedDict()
+        self._items = 0
+        # Читатели в потокобезопасном режиме обращаются к кэшу одновременно
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, generation: int) -> Optional[List]:
+        """Возвращает результат запроса, если он получен в текущем поколении данных"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == generation:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                self._discard(key)
+            self.misses += 1
+            return None
+
+    def put(self, key: Hashable, generation: int, results: List) -> None:
+        """Сохраняет результат запроса, вытесняя давно не использованные записи"""
+        if not self.maxsize or len(results) > self.max_items:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._discard(key)
+            self._entries[key] = (generation, results)
+            self._items += len(results)
+            while len(self._entries) > self.maxsize or self._items > self.max_items:
+                self._discard(next(iter(self._entries)))
+
+    def _discard(self, key: Hashable) -> None:
+        self._items -= len(self._entries.pop(key)[1])
+
+    def clear(self) -> None:
+        """Удаляет все записи и сбрасывает счетчики"""
+        with self._lock:
+            self._entries.clear()
+            self._items = self.hits = self.misses = 0
+
+    def info(self) -> CacheInfo:
+        """Возвращает число попаданий и промахов, а также размер кэша"""
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._entries))
@@ -0,0 +1,211 @@
+import argparse
+import json
+import shlex
+import sys
+from contextlib import nullcontext
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+from app.task import PRIORITY_LABELS, STATUS_LABELS, parse_due_date
+from app.task_manager import TaskManager
+
+# Коды завершения: успех, задачи не найдены, ошибка в командах или данных
+EXIT_OK = 0
+EXIT_NOT_FOUND = 1
+EXIT_ERROR = 2
+# Команды пакетного режима: все они изменяют задачи и записываются одним сохранением
+BATCH_COMMANDS = ("add", "edit", "done", "delete")
+
+
+class CommandError(ValueError):
+    """Ошибка в аргументах команды"""
+
+
+class CommandParser(argparse.ArgumentParser):
+    """Разбор аргументов, сообщающий об ошибке исключением, чтобы ошибка в строке пакета
+    не завершала процесс до отмены пакетной операции"""
+
+    def error(self, message: str):
+        raise CommandError(f"{self.prog}: {message}")
+
+
+def due_date(value: str) -> date:
+    """Преобразует срок в формате дд.мм.гггг в дату"""
+    return date.fromordinal(parse_due_date(value))
+
+
+def positive_int(value: str) -> int:
+    """Преобразует аргумент в положительное целое число"""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"ожидается положительное число: {value}")
+    return number
+
+
+def build_parser(filename: str = "tasks.json", add_help: bool = True) -> CommandParser:
+    """Создает разбор аргументов командной строки. При add_help=False -h/--help считаются ошибкой аргументов:
+    так разбираются строки пакета, где вывод справки завершил бы процесс посреди пакета"""
+    parser = CommandParser(prog="main.py", description="Управление задачами без интерактивного меню",
+                           add_help=add_help)
+    parser.add_argument("--file", default=filename, help="файл или каталог хранения задач")
+    parser.add_argument("--json", action="store_true", help="вывод результатов в формате JSON")
+    commands = parser.add_subparsers(dest="command", required=True, parser_class=CommandParser)
+
+    add = commands.add_parser("add", add_help=add_help, help="добавить задачу")
+    add.add_argument("title", help="название")
+    add.add_argument("-d", "--description", required=True, help="описание")
+    add.add_argument("-c", "--category", required=True, help="категория")
+    add.add_argument("--due", dest="due_date", required=True, help="срок выполнения в формате дд.мм.гггг")
+    add.add_argument("-p", "--priority", type=str.lower, choices=PRIORITY_LABELS, required=True, help="приоритет")
+
+    edit = commands.add_parser("edit", add_help=add_help, help="изменить поля задачи")
+    edit.add_argument("id", type=int, help="ID задачи")
+    edit.add_argument("-t", "--title", help="новое название")
+    edit.add_argument("-d", "--description", help="новое описание")
+    edit.add_argument("-c", "--category", help="новая категория")
+    edit.add_argument("--due", dest="due_date", help="новый срок выполнения в формате дд.мм.гггг")
+    edit.add_argument("-p", "--priority", type=str.lower, choices=PRIORITY_LABELS, help="новый приоритет")
+
+    done = commands.add_parser("done", add_help=add_help, help="отметить задачи как выполненные")
+    done.add_argument("ids", type=int, nargs="+", help="ID задач")
+
+    delete = commands.add_parser("delete", add_help=add_help, help="удалить задачи по ID или категории")
+    delete.add_argument("ids", type=int, nargs="*", help="ID задач")
+    delete.add_argument("-c", "--category", help="удалить все задачи категории")
+
+    search = commands.add_parser("search", add_help=add_help, help="найти задачи по нескольким критериям")
+    search.add_argument("-k", "--keyword", help="ключевое слово в названии или описании")
+    search.add_argument("-c", "--category", help="категория")
+    search.add_argument("-s", "--status", type=str.lower, choices=STATUS_LABELS, help="статус выполнения")
+    search.add_argument("-p", "--priority", type=str.lower, choices=PRIORITY_LABELS, help="приоритет")
+    search.add_argument("--due-after", type=due_date, help="срок не раньше даты дд.мм.гггг")
+    search.add_argument("--due-before", type=due_date, help="срок не позже даты дд.мм.гггг")
+    search.add_argument("--overdue", action="store_true", help="просроченные невыполненные задачи")
+    search.add_argument("--due-within", type=int, help="невыполненные задачи со сроком в ближайшие дни")
+    search.add_argument("--limit", type=positive_int, help="наибольшее число выводимых задач")
+
+    listing = commands.add_parser("list", add_help=add_help, help="вывести задачи")
+    listing.add_argument("-c", "--category", help="категория")
+    listing.add_argument("--limit", type=positive_int, help="наибольшее число выводимых задач")
+
+    batch = commands.add_parser("batch", add_help=add_help,
+                                help="выполнить команды из файла или стандартного ввода с одним сохранением")
+    batch.add_argument("source", nargs="?", default="-", help="файл команд, по умолчанию стандартный ввод")
+    return parser
+
+
+def execute(tasks_manager: TaskManager, args: argparse.Namespace) -> Tuple[int, Dict]:
+    """Выполняет команду и возвращает код завершения и результат для вывода в формате JSON.
+    Сообщения для человека выводит сам TaskManager, если он создан с verbose=True"""
+    if args.command == "add":
+        task = tasks_manager.add_task(args.title, args.description, args.category, args.due_date, args.priority)
+        return EXIT_OK, {"task": task.to_dict()}
+
+    if args.command == "edit":
+        task = tasks_manager.edit_task(args.id, args.title, args.description, args.category, args.due_date,
+                                       args.priority)
+        if task is None:
+            return EXIT_NOT_FOUND, {"missing": [args.id]}
+        return EXIT_OK, {"task": task.to_dict()}
+
+    if args.command == "done":
+        # Несколько задач изменяются одной пакетной операцией с одним сохранением
+        with tasks_manager.batch() if len(args.ids) > 1 else nullcontext():
+            tasks = [tasks_manager.update_status(task_id) for task_id in args.ids]
+        missing = [task_id for task_id, task in zip(args.ids, tasks) if task is None]
+        return (EXIT_NOT_FOUND if missing else EXIT_OK,
+                {"tasks": [task.to_dict() for task in tasks if task], "missing": missing})
+
+    if args.command == "delete":
+        if not args.ids and not args.category:
+            raise CommandError("delete: укажите ID задач или категорию")
+        deleted, missing = [], []
+        with tasks_manager.batch() if len(args.ids) + bool(args.category) > 1 else nullcontext():
+            for task_id in args.ids:
+                tasks = tasks_manager.delete_tasks(task_id=task_id)
+                deleted.extend(tasks)
+                if not tasks:
+                    missing.append(task_id)
+            if args.category:
+                tasks = tasks_manager.delete_tasks(category=args.category)
+                deleted.extend(tasks)
+                if not tasks:
+                    missing.append(args.category)
+        return EXIT_NOT_FOUND if missing else EXIT_OK, {"deleted": [task.id for task in deleted], "missing": missing}
+
+    if args.command == "search":
+        criteria = {"keyword": args.keyword, "category": args.category, "status": args.status,
+                    "priority": args.priority, "due_before": args.due_before, "due_after": args.due_after,
+                    "overdue": args.overdue, "due_within": args.due_within}
+        tasks = tasks_manager.find_tasks(**criteria)
+        if tasks_manager.verbose:
+            tasks_manager.search_tasks(**criteria, limit=args.limit)
+    else:  # list
+        tasks = tasks_manager.get_tasks(category=args.category) if args.category else tasks_manager.tasks
+        if tasks_manager.verbose:
+            tasks_manager.list_tasks(args.category, limit=args.limit)
+    return EXIT_OK if tasks else EXIT_NOT_FOUND, {"tasks": [task.to_dict() for task in tasks[:args.limit]]}
+
+
+def run_batch(tasks_manager: TaskManager, parser: CommandParser, source: str) -> Tuple[int, Dict]:
+    """Выполняет команды из файла source или стандартного ввода, по одной команде в строке.
+    Все строки разбираются до выполнения, а команды применяются одной пакетной операцией
+    с одним сохранением, поэтому ошибка в любой строке не оставляет частично примененных изменений"""
+    if source == "-":
+        lines = sys.stdin.readlines()
+    else:
+        with open(source, "r", encoding="utf-8") as file:
+            lines = file.readlines()
+
+    commands = []
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        try:
+            args = parser.parse_args(shlex.split(line))
+        except ValueError as error:  # Ошибка разбора аргументов или незакрытая кавычка
+            raise CommandError(f"строка {number}: {error}") from None
+        if args.command not in BATCH_COMMANDS:
+            raise CommandError(f"строка {number}: команда {args.command} недоступна в пакетном режиме")
+        commands.append((number, args))
+
+    code, results = EXIT_OK, []
+    with tasks_manager.batch():
+        for number, args in commands:
+            try:
+                command_code, result = execute(tasks_manager, args)
+            except ValueError as error:
+                raise CommandError(f"строка {number}: {error}") from None
+            code = max(code, command_code)
+            results.append({"line": number, "command": args.command, "ok": command_code == EXIT_OK, **result})
+    return code, {"results": results}
+
+
+def main(argv: Optional[List[str]] = None, filename: str = "tasks.json") -> int:
+    """Выполняет команду командной строки и возвращает код завершения"""
+    parser = build_parser(filename)
+    try:
+        args = parser.parse_args(argv)
+    except CommandError as error:
+        parser.print_usage(sys.stderr)
+        print(error, file=sys.stderr)
+        return EXIT_ERROR
+
+    # Несколько процессов могут одновременно изменять один файл задач. Поиск в хранилищах,
+    # которые выполняют запросы сами, не требует загрузки всех задач
+    tasks_manager = TaskManager(args.file, shared=True, verbose=not args.json, lazy=True)
+    try:
+        if args.command == "batch":
+            code, result = run_batch(tasks_manager, build_parser(filename, add_help=False), args.source)
+        else:
+            code, result = execute(tasks_manager, args)
+    except (ValueError, OSError) as error:
+        code, result = EXIT_ERROR, {"error": str(error)}
+        if not args.json:
+            print(f"Ошибка: {error}", file=sys.stderr)
+    finally:
+        tasks_manager.close()
+
+    if args.json:
+        print(json.dumps({"ok": code == EXIT_OK, **result}, ensure_ascii=False))
+    return code
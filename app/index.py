@@ -0,0 +1,251 @@
+import heapq
+from bisect import bisect_left, bisect_right, insort
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from app.task import Priority, Task
+
+
+class SortedIds:
+    """Возрастающий список ID задач с переходом к позиции за ID курсора двоичным поиском"""
+
+    __slots__ = ("_ids",)
+
+    def __init__(self, ids: Iterable[int] = ()):
+        self._ids: List[int] = sorted(ids)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def add(self, task_id: int) -> None:
+        """Добавляет ID, новые задачи с наибольшим ID дописываются в конец без сдвига"""
+        if not self._ids or task_id > self._ids[-1]:
+            self._ids.append(task_id)
+        else:
+            insort(self._ids, task_id)
+
+    def remove(self, task_id: int) -> None:
+        """Удаляет ID"""
+        del self._ids[bisect_left(self._ids, task_id)]
+
+    def remove_many(self, task_ids: Set[int]) -> None:
+        """Удаляет несколько ID одним проходом по списку вместо сдвига списка на каждое удаление"""
+        self._ids = [task_id for task_id in self._ids if task_id not in task_ids]
+
+    def after(self, task_id: Optional[int] = None) -> Iterator[int]:
+        """Перебирает ID больше task_id, переход к началу перебора выполняется за O(log n)"""
+        ids = self._ids
+        start = 0 if task_id is None else bisect_right(ids, task_id)
+        return (ids[position] for position in range(start, len(ids)))
+
+
+class FieldIndex:
+    """Вторичный индекс задач по значению поля без учета регистра"""
+
+    def __init__(self, field: str):
+        self.field = field
+        self.fields = {field}
+        self._buckets: Dict[str, Dict[int, Task]] = {}
+        # Упорядоченные ID задач каждого значения для постраничного перебора
+        self._ordered: Dict[str, SortedIds] = {}
+
+    @staticmethod
+    def normalize(value: str) -> str:
+        """Приводит значение поля к ключу индекса"""
+        return value.casefold()
+
+    def add(self, task: Task) -> None:
+        """Добавляет задачу в индекс"""
+        key = self.normalize(getattr(task, self.field))
+        self._buckets.setdefault(key, {})[task.id] = task
+        self._ordered.setdefault(key, SortedIds()).add(task.id)
+
+    def remove(self, task: Task) -> None:
+        """Удаляет задачу из индекса"""
+        key = self.normalize(getattr(task, self.field))
+        bucket = self._buckets[key]
+        del bucket[task.id]
+        self._ordered[key].remove(task.id)
+        if not bucket:
+            del self._buckets[key]
+            del self._ordered[key]
+
+    def remove_many(self, tasks: Iterable[Task]) -> None:
+        """Удаляет несколько задач, упорядоченные ID каждого значения перестраиваются один раз"""
+        groups: Dict[str, Set[int]] = {}
+        for task in tasks:
+            groups.setdefault(self.normalize(getattr(task, self.field)), set()).add(task.id)
+        for key, task_ids in groups.items():
+            bucket = self._buckets[key]
+            for task_id in task_ids:
+                del bucket[task_id]
+            if bucket:
+                self._ordered[key].remove_many(task_ids)
+            else:
+                del self._buckets[key]
+                del self._ordered[key]
+
+    def get(self, value: str) -> Dict[int, Task]:
+        """Возвращает задачи с указанным значением поля в порядке добавления"""
+        return self._buckets.get(self.normalize(value), {})
+
+    def ordered(self, value: str) -> SortedIds:
+        """Возвращает ID задач с указанным значением поля в порядке возрастания"""
+        return self._ordered.get(self.normalize(value), SortedIds())
+
+
+class TrigramIndex:
+    """Инвертированный индекс триграмм по названию и описанию задач"""
+
+    fields = {"title", "description"}
+
+    def __init__(self):
+        self._postings: Dict[str, Set[int]] = {}
+        # Нормализованные тексты задач для проверки кандидатов без повторного приведения регистра
+        self._texts: Dict[int, Tuple[str, str]] = {}
+
+    @staticmethod
+    def trigrams(text: str) -> Set[str]:
+        """Возвращает множество триграмм строки"""
+        return {text[i:i + 3] for i in range(len(text) - 2)}
+
+    def _grams(self, texts: Iterable[str]) -> Set[str]:
+        return set().union(*map(self.trigrams, texts))
+
+    def add(self, task: Task) -> None:
+        """Добавляет задачу в индекс"""
+        texts = (task.title.lower(), task.description.lower())
+        self._texts[task.id] = texts
+        for gram in self._grams(texts):
+            self._postings.setdefault(gram, set()).add(task.id)
+
+    def remove(self, task: Task) -> None:
+        """Удаляет задачу из индекса"""
+        for gram in self._grams(self._texts.pop(task.id)):
+            posting = self._postings[gram]
+            posting.discard(task.id)
+            if not posting:
+                del self._postings[gram]
+
+    def remove_many(self, tasks: Iterable[Task]) -> None:
+        """Удаляет несколько задач из индекса"""
+        for task in tasks:
+            self.remove(task)
+
+    def candidates(self, keyword: str) -> Optional[Set[int]]:
+        """Возвращает ID задач, содержащих все триграммы запроса, или None для коротких запросов"""
+        keyword = keyword.lower()
+        if len(keyword) < 3:
+            return None
+        postings = sorted((self._postings.get(gram, set()) for gram in self.trigrams(keyword)), key=len)
+        return postings[0].intersection(*postings[1:])
+
+    def matches(self, task_id: int, keyword: str) -> bool:
+        """Проверяет вхождение уже приведенного к нижнему регистру запроса в тексты задачи"""
+        title, description = self._texts[task_id]
+        return keyword in title or keyword in description
+
+    def search(self, keyword: str) -> List[int]:
+        """Возвращает ID задач, в названии или описании которых встречается подстрока"""
+        candidates = self.candidates(keyword)
+        if candidates is None:
+            # Слишком короткий запрос проверяется по всем задачам
+            candidates = self._texts.keys()
+        keyword = keyword.lower()
+        return [task_id for task_id in candidates if self.matches(task_id, keyword)]
+
+
+class DueIndex:
+    """Упорядоченный по сроку выполнения индекс задач для запросов по диапазону дат"""
+
+    fields = {"due_date"}
+
+    def __init__(self, tasks: Iterable[Task] = ()):
+        # Отсортированный список пар (порядковый номер дня, ID задачи).
+        # Начальный набор задач сортируется один раз, а не вставляется по одной
+        self._keys: List[Tuple[int, int]] = sorted((task.due_ordinal, task.id) for task in tasks)
+
+    def add(self, task: Task) -> None:
+        """Добавляет задачу в индекс"""
+        insort(self._keys, (task.due_ordinal, task.id))
+
+    def remove(self, task: Task) -> None:
+        """Удаляет задачу из индекса"""
+        del self._keys[bisect_left(self._keys, (task.due_ordinal, task.id))]
+
+    def remove_many(self, tasks: Iterable[Task]) -> None:
+        """Удаляет несколько задач одним проходом по индексу"""
+        task_ids = {task.id for task in tasks}
+        self._keys = [key for key in self._keys if key[1] not in task_ids]
+
+    def _bounds(self, first: Optional[int], last: Optional[int]) -> Tuple[int, int]:
+        low = 0 if first is None else bisect_left(self._keys, (first,))
+        high = len(self._keys) if last is None else bisect_left(self._keys, (last + 1,))
+        return low, max(low, high)
+
+    def count(self, first: Optional[int] = None, last: Optional[int] = None) -> int:
+        """Возвращает число задач со сроком в диапазоне [first, last] за O(log n)"""
+        low, high = self._bounds(first, last)
+        return high - low
+
+    def between(self, first: Optional[int] = None, last: Optional[int] = None) -> List[int]:
+        """Возвращает ID задач со сроком в диапазоне [first, last] в порядке срока.
+        Граница None означает отсутствие ограничения с этой стороны"""
+        low, high = self._bounds(first, last)
+        return [task_id for _, task_id in self._keys[low:high]]
+
+
+class Agenda:
+    """Очередь невыполненных задач по убыванию приоритета и возрастанию срока.
+    Удаленные и измененные задачи не извлекаются из кучи сразу: их записи считаются устаревшими
+    и пропускаются при чтении, а куча перестраивается, когда устаревших записей становится больше живых"""
+
+    fields = {"priority", "status", "due_date"}
+
+    def __init__(self, tasks: Iterable[Task] = ()):
+        # Актуальная запись кучи для каждой невыполненной задачи
+        self._live: Dict[int, Tuple[int, int, int]] = {}
+        self._stale = 0
+        for task in tasks:
+            if task.status == "не выполнена":
+                self._live[task.id] = self._entry(task)
+        self._heap = list(self._live.values())
+        heapq.heapify(self._heap)
+
+    @staticmethod
+    def _entry(task: Task) -> Tuple[int, int, int]:
+        return -Priority.parse(task.priority), task.due_ordinal, task.id
+
+    def add(self, task: Task) -> None:
+        """Добавляет задачу в очередь, если она не выполнена"""
+        if task.status != "не выполнена":
+            return
+        if self._stale > len(self._live):
+            self._heap = list(self._live.values())
+            heapq.heapify(self._heap)
+            self._stale = 0
+        entry = self._entry(task)
+        self._live[task.id] = entry
+        heapq.heappush(self._heap, entry)
+
+    def remove(self, task: Task) -> None:
+        """Помечает запись задачи в очереди устаревшей"""
+        if self._live.pop(task.id, None) is not None:
+            self._stale += 1
+
+    def remove_many(self, tasks: Iterable[Task]) -> None:
+        """Помечает записи нескольких задач устаревшими"""
+        for task in tasks:
+            self.remove(task)
+
+    def top(self, count: int) -> List[int]:
+        """Возвращает ID первых count задач очереди за O(k log n), не изменяя кучу"""
+        result = []
+        # Обход кучи как дерева: кандидатами служат потомки уже выбранных узлов
+        frontier = [(self._heap[0], 0)] if self._heap else []
+        while frontier and len(result) < count:
+            entry, position = heapq.heappop(frontier)
+            if self._live.get(entry[2]) is entry:
+                result.append(entry[2])
+            for child in (2 * position + 1, 2 * position + 2):
+                if child < len(self._heap):
+                    heapq.heappush(frontier, (self._heap[child], child))
+        return result
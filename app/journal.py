@@ -0,0 +1,60 @@
+import json
+import os
+from typing import Dict, Iterable, Iterator
+from app.stats import WriteMeter
+
+
+def append_lines(filename: str, lines: Iterable[str]) -> None:
+    """Дописывает строки в конец файла. Если файл оканчивается недописанной строкой после аварийного
+    завершения, запись начинается с новой строки, чтобы обрывок не поглотил первую из новых строк"""
+    with open(filename, "a+b") as file:
+        end = file.seek(0, os.SEEK_END)
+        torn = False
+        if end:
+            file.seek(end - 1)
+            torn = file.read(1) != b"\n"
+        data = (("\n" if torn else "") + "".join(line + "\n" for line in lines)).encode("utf-8")
+        file.write(data)
+    WriteMeter.add(len(data))
+
+
+class Journal:
+    """Журнал операций: одна запись JSON на строку, только дозапись в конец файла"""
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        try:
+            with open(self.filename, "rb") as file:
+                self.size = sum(1 for _ in file)
+        except FileNotFoundError:
+            self.size = 0
+
+    def append(self, record: Dict) -> None:
+        """Дописывает запись об операции в конец журнала"""
+        append_lines(self.filename, [json.dumps(record, ensure_ascii=False, separators=(",", ":"))])
+        self.size += 1
+
+    def replay(self) -> Iterator[Dict]:
+        """Последовательно возвращает записи журнала"""
+        try:
+            # Обрывок строки может заканчиваться на середине символа UTF-8
+            with open(self.filename, "r", encoding="utf-8", errors="replace") as file:
+                for line in file:
+                    if not line.strip():
+                        continue
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError:
+                        # Недописанная строка после аварийного завершения пропускается,
+                        # записи, дописанные после нее, остаются действительными
+                        continue
+        except FileNotFoundError:
+            return
+
+    def clear(self) -> None:
+        """Очищает журнал после сохранения снимка"""
+        try:
+            os.remove(self.filename)
+        except FileNotFoundError:
+            pass
+        self.size = 0
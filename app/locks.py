@@ -0,0 +1,78 @@
+import threading
+from contextlib import contextmanager, nullcontext
+from typing import ContextManager, Iterator
+
+
+class RWLock:
+    """Блокировка с разделением на чтение и запись.
+    Читатели не мешают друг другу, писатель получает исключительный доступ и имеет приоритет
+    перед новыми читателями. Поток, владеющий блокировкой, может захватывать ее повторно"""
+
+    def __init__(self):
+        self._condition = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = None
+        self._writer_depth = 0
+        self._writers_waiting = 0
+        self._local = threading.local()
+
+    @contextmanager
+    def read(self) -> Iterator[None]:
+        """Захватывает блокировку на чтение"""
+        depth = getattr(self._local, "depth", 0)
+        if depth or self._writer == threading.get_ident():
+            # Повторный захват тем же потоком не ждет, иначе ожидающий писатель привел бы к взаимоблокировке
+            self._local.depth = depth + 1
+            try:
+                yield
+            finally:
+                self._local.depth = depth
+            return
+        with self._condition:
+            while self._writer is not None or self._writers_waiting:
+                self._condition.wait()
+            self._readers += 1
+        self._local.depth = 1
+        try:
+            yield
+        finally:
+            self._local.depth = 0
+            with self._condition:
+                self._readers -= 1
+                if not self._readers:
+                    self._condition.notify_all()
+
+    @contextmanager
+    def write(self) -> Iterator[None]:
+        """Захватывает исключительную блокировку на запись"""
+        ident = threading.get_ident()
+        with self._condition:
+            if self._writer != ident:
+                self._writers_waiting += 1
+                try:
+                    while self._writer is not None or self._readers:
+                        self._condition.wait()
+                finally:
+                    self._writers_waiting -= 1
+                self._writer = ident
+            self._writer_depth += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._writer_depth -= 1
+                if not self._writer_depth:
+                    self._writer = None
+                    self._condition.notify_all()
+
+
+class NoLock:
+    """Заглушка RWLock для однопоточной работы без накладных расходов на синхронизацию"""
+
+    _context = nullcontext()
+
+    def read(self) -> ContextManager:
+        return self._context
+
+    def write(self) -> ContextManager:
+        return self._context
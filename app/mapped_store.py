@@ -0,0 +1,240 @@
+import mmap
+import os
+import struct
+import threading
+from bisect import bisect_left
+from collections import OrderedDict
+from datetime import date
+from typing import Iterable, Iterator, List, Optional
+from app.cache import CacheInfo
+from app.index import FieldIndex
+from app.snapshot import pack_strings, unpack_strings
+from app.storage import Storage, atomic_write, file_stamp
+from app.task import PRIORITY_LABELS, STATUS_LABELS, Priority, Status, Task
+
+# Заголовок: сигнатура, версия, число задач, смещения таблицы строк и таблицы ID.
+# За заголовком идут тексты задач, затем таблица строк и выровненные по 8 байтам таблицы:
+# возрастающие ID, смещения текстов и коды полей каждой задачи
+MAGIC = b"TSKM"
+VERSION = 1
+HEADER = struct.Struct("<4sHxxQQQ")
+# Текст задачи: длины названия и описания в байтах, затем сами строки в UTF-8
+TEXT = struct.Struct("<II")
+# Коды полей задачи: номера категории, приоритета и статуса в таблице строк и срок
+COLUMNS = struct.Struct("<IIII")
+ID = struct.Struct("<Q")
+
+
+def write_mapped(filename: str, tasks: Iterable[Task]) -> None:
+    """Записывает задачи в файл для отображения в память"""
+    tasks = sorted(tasks, key=lambda task: task.id)
+    strings = {}
+    texts, offsets, columns = [], [], []
+    offset = HEADER.size
+    for task in tasks:
+        title, description = task.title.encode("utf-8"), task.description.encode("utf-8")
+        text = TEXT.pack(len(title), len(description)) + title + description
+        texts.append(text)
+        offsets.append(offset)
+        offset += len(text)
+        columns.append(COLUMNS.pack(strings.setdefault(task.category, len(strings)),
+                                    strings.setdefault(task.priority, len(strings)),
+                                    strings.setdefault(task.status, len(strings)), task.due_ordinal))
+    table = pack_strings(strings)
+    table += bytes(-(offset + len(table)) % ID.size)
+    header = HEADER.pack(MAGIC, VERSION, len(tasks), offset, offset + len(table))
+    with atomic_write(filename, binary=True) as file:
+        file.write(header)
+        file.write(b"".join(texts))
+        file.write(table)
+        file.write(struct.pack(f"<{len(tasks)}Q", *(task.id for task in tasks)))
+        file.write(struct.pack(f"<{len(tasks)}Q", *offsets))
+        file.write(b"".join(columns))
+
+
+class MappedTaskStore(Storage):
+    """Хранилище задач в файле, отображенном в память. При открытии читается только таблица строк,
+    задачи декодируются по одной при обращении и кэшируются в ограниченном LRU-кэше,
+    а поиск проверяет коды полей прямо в отображенном файле без создания объектов Task"""
+
+    queryable = True
+
+    def __init__(self, filename: str, cache_size: int = 1024):
+        self.filename = filename
+        self.cache_size = cache_size
+        self.hits = 0
+        self.misses = 0
+        self._cache: "OrderedDict[int, Task]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._file = self._map = None
+        self._open()
+
+    def _open(self) -> None:
+        self._strings: List[str] = []
+        self._priorities, self._statuses = {}, {}
+        self._ids = self._offsets = ()
+        self._columns = memoryview(b"")
+        # Отметка версии отображенного файла: другой процесс подменяет файл целиком
+        self._stamp = None
+        try:
+            self._file = open(self.filename, "rb")
+        except FileNotFoundError:
+            return
+        stat = os.fstat(self._file.fileno())
+        self._stamp = stat.st_mtime_ns, stat.st_size, stat.st_ino
+        if stat.st_size < HEADER.size:
+            self._file.close()
+            self._file = None
+            raise ValueError("Файл задач поврежден")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count, strings_offset, ids_offset = HEADER.unpack_from(self._map)
+        if magic != MAGIC:
+            self._release()
+            raise ValueError("Файл не является отображаемым файлом задач")
+        if version > VERSION:
+            self._release()
+            raise ValueError(f"Версия файла задач {version} не поддерживается")
+        self._strings = unpack_strings(self._map, strings_offset)[0]
+        self._priorities = {index: Priority.parse(string) for index, string in enumerate(self._strings)
+                            if string in PRIORITY_LABELS}
+        self._statuses = {index: Status.parse(string) for index, string in enumerate(self._strings)
+                          if string in STATUS_LABELS}
+        # Таблицы ID и смещений используются на месте: поиск ID выполняется двоичным поиском по файлу
+        view = memoryview(self._map)
+        offsets_offset = ids_offset + count * ID.size
+        columns_offset = offsets_offset + count * ID.size
+        self._ids = view[ids_offset:offsets_offset].cast("Q")
+        self._offsets = view[offsets_offset:columns_offset].cast("Q")
+        self._columns = view[columns_offset:columns_offset + count * COLUMNS.size]
+        view.release()
+
+    def _release(self) -> None:
+        # Отображение нельзя закрыть, пока на него ссылаются представления таблиц
+        for table in (self._ids, self._offsets, self._columns):
+            if isinstance(table, memoryview):
+                table.release()
+        self._ids = self._offsets = ()
+        self._columns = memoryview(b"")
+        if self._map is not None:
+            self._map.close()
+            self._file.close()
+        self._file = self._map = None
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def ids(self) -> Iterator[int]:
+        """Перебирает ID задач в порядке возрастания"""
+        return iter(self._ids)
+
+    def _text(self, position: int) -> tuple:
+        offset = self._offsets[position]
+        title_length, description_length = TEXT.unpack_from(self._map, offset)
+        offset += TEXT.size
+        title = str(self._map[offset:offset + title_length], "utf-8")
+        offset += title_length
+        return title, str(self._map[offset:offset + description_length], "utf-8")
+
+    def _contains(self, position: int, keyword: str) -> bool:
+        # Название и описание лежат подряд и отсеиваются одним декодированием,
+        # раздельная проверка нужна только для совпадений, которые могут пересекать их границу
+        offset = self._offsets[position]
+        title_length, description_length = TEXT.unpack_from(self._map, offset)
+        offset += TEXT.size
+        if keyword not in str(self._map[offset:offset + title_length + description_length], "utf-8").lower():
+            return False
+        title, description = self._text(position)
+        return keyword in title.lower() or keyword in description.lower()
+
+    def _build(self, position: int) -> Task:
+        category, priority, status, due = COLUMNS.unpack_from(self._columns, position * COLUMNS.size)
+        return Task.restore(self._ids[position], *self._text(position), self._strings[category], due,
+                            self._priorities[priority], self._statuses[status])
+
+    def _decode(self, position: int) -> Task:
+        task_id = self._ids[position]
+        with self._lock:
+            task = self._cache.get(task_id)
+            if task is not None:
+                self._cache.move_to_end(task_id)
+                self.hits += 1
+                return task
+            self.misses += 1
+        task = self._build(position)
+        if self.cache_size:
+            with self._lock:
+                self._cache[task_id] = task
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return task
+
+    def get_task(self, task_id: int) -> Optional[Task]:
+        """Декодирует задачу по ID, если она есть в файле"""
+        position = bisect_left(self._ids, task_id)
+        if position == len(self._ids) or self._ids[position] != task_id:
+            return None
+        return self._decode(position)
+
+    def _codes(self, value: Optional[str], labels: Iterable[str] = None) -> Optional[set]:
+        # Номера строк таблицы, совпадающих со значением без учета регистра
+        if not value:
+            return None
+        value = FieldIndex.normalize(value)
+        return {index for index, string in enumerate(self._strings)
+                if FieldIndex.normalize(string) == value and (labels is None or string in labels)}
+
+    def query(self, keyword: Optional[str] = None,
+              category: Optional[str] = None,
+              status: Optional[str] = None,
+              priority: Optional[str] = None,
+              due_before: Optional[date] = None,
+              due_after: Optional[date] = None) -> Iterator[Task]:
+        """Перебирает задачи, удовлетворяющие всем критериям, в порядке возрастания ID.
+        Категория, статус, приоритет и срок проверяются по кодам в файле, для ключевого слова
+        декодируются только названия и описания, а объекты Task создаются лишь для найденных задач"""
+        categories = self._codes(category)
+        statuses = self._codes(status, STATUS_LABELS)
+        priorities = self._codes(priority, PRIORITY_LABELS)
+        first = due_after.toordinal() if due_after else 0
+        last = due_before.toordinal() if due_before else date.max.toordinal()
+        keyword = keyword.lower() if keyword else None
+        for position, (task_category, task_priority, task_status, due) in \
+                enumerate(COLUMNS.iter_unpack(self._columns)):
+            if categories is not None and task_category not in categories:
+                continue
+            if statuses is not None and task_status not in statuses:
+                continue
+            if priorities is not None and task_priority not in priorities:
+                continue
+            if not first <= due <= last:
+                continue
+            if keyword and not self._contains(position, keyword):
+                continue
+            yield self._decode(position)
+
+    def load(self) -> Iterator[Task]:
+        """Последовательно декодирует все задачи файла, не вытесняя ими кэш.
+        Если файл подменил другой процесс, он отображается в память заново"""
+        if file_stamp(self.filename) != self._stamp:
+            self._release()
+            with self._lock:
+                self._cache.clear()
+            self._open()
+        return (self._build(position) for position in range(len(self._ids)))
+
+    def save(self, tasks: Iterable[Task]) -> None:
+        """Перезаписывает файл задач и заново отображает его в память"""
+        tasks = list(tasks)
+        self._release()
+        write_mapped(self.filename, tasks)
+        with self._lock:
+            self._cache.clear()
+        self._open()
+
+    def cache_info(self) -> CacheInfo:
+        """Возвращает число попаданий и промахов, а также размер кэша декодированных задач"""
+        return CacheInfo(self.hits, self.misses, self.cache_size, len(self._cache))
+
+    def close(self) -> None:
+        """Закрывает отображение файла"""
+        self._release()
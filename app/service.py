@@ -1,11 +1,46 @@
 from datetime import datetime
-from typing import Dict
+from typing import Callable, Dict, Optional
 from app.task_manager import TaskManager
 
 
-def list_tasks(tasks_manager: TaskManager, option: str) -> None:
+def show_pages(show_page: Callable[[Optional[str]], Optional[str]]) -> None:
+    # show_page выводит страницу, начинающуюся за курсором, и возвращает курсор следующей страницы
+    cursors = [None]
+    next_cursor = show_page(None)
+    while next_cursor or len(cursors) > 1:
+        print("\nПодменю:")
+        print("1. Следующая страница")
+        print("2. Предыдущая страница")
+        print("3. Возврат в основное меню")
+        page_choice = input("Выберите поддействие: ").strip()
+        print('')
+
+        if page_choice == "1":
+            if not next_cursor:
+                print("Это последняя страница")
+                continue
+            cursors.append(next_cursor)
+        elif page_choice == "2":
+            if len(cursors) == 1:
+                print("Это первая страница")
+                continue
+            cursors.pop()
+        elif page_choice == "3":
+            print("Возврат в основное меню...")
+            return
+        else:
+            print("Неверный выбор поддействия!")
+            continue
+        next_cursor = show_page(cursors[-1])
+
+
+def list_tasks(tasks_manager: TaskManager, option: str, page_size: Optional[int] = None) -> None:
+    if option == "3":  # Ближайшие невыполненные задачи
+        tasks_manager.show_next_tasks()
+        return
+
     category = None
-    if option == "2" and tasks_manager.tasks:
+    if option == "2" and tasks_manager.has_tasks():
         while True:
             category = input("Введите категорию задачи или введите 'отмена' для возврата в основное меню: ").strip()
 
@@ -19,7 +54,7 @@ def list_tasks(tasks_manager: TaskManager, option: str) -> None:
 
             break
 
-    tasks_manager.list_tasks(category)
+    show_pages(lambda cursor: tasks_manager.list_tasks(category, limit=page_size, cursor=cursor))
 
 
 def add_task(tasks_manager: TaskManager) -> None:
@@ -62,7 +97,7 @@ def add_task(tasks_manager: TaskManager) -> None:
         print("Не удалось создать задачу")
         return
 
-    new_task_dict["due_date"] = f"{new_task_dict["due_date"]:%d.%m.%Y}"
+    new_task_dict["due_date"] = f"{new_task_dict['due_date']:%d.%m.%Y}"
     tasks_manager.add_task(**new_task_dict)
 
 
@@ -222,7 +257,113 @@ def delete_task(tasks_manager: TaskManager, option: str) -> None:
         return
 
 
-def search_tasks(tasks_manager: TaskManager, option: str) -> None:
+def search_tasks_by_fields() -> Dict:
+    field_map = {"keyword": "Ключевое слово",
+                 "category": "Категория",
+                 "status": "Статус (выполнена/не выполнена)",
+                 "priority": "Приоритет (низкий/средний/высокий)",
+                 "due_before": "Срок выполнения не позднее (дд.мм.гггг)"}
+    search_dict = {}
+    print("Введите критерии поиска: пустая строка пропускает критерий, 'отмена' возвращает в основное меню")
+    for search_key, input_str in field_map.items():
+        while True:
+            user_input = input(f"{input_str}: ").strip()
+
+            if user_input == "отмена":
+                print("Поиск задач отменен")
+                return {}
+
+            if not user_input:
+                break
+
+            # Проверка и обработка данных
+            if search_key == "status" and user_input.lower() not in ["выполнена", "не выполнена"]:
+                print("Некорректный статус для поиска!")
+                continue
+            if search_key == "priority" and user_input.lower() not in ["низкий", "средний", "высокий"]:
+                print("Некорректный приоритет задачи! Используйте: низкий, средний или высокий")
+                continue
+            if search_key == "due_before":
+                try:
+                    user_input = datetime.strptime(user_input, "%d.%m.%Y").date()
+                except ValueError:
+                    print("Некорректный формат даты! Используйте формат дд.мм.гггг")
+                    continue
+
+            search_dict[search_key] = user_input
+            break
+
+    if not search_dict:
+        print("Не указаны критерии для поиска задач")
+    return search_dict
+
+
+def search_tasks_by_due_date() -> Dict:
+    field_map = {"due_after": "Срок выполнения не ранее (дд.мм.гггг)",
+                 "due_before": "Срок выполнения не позднее (дд.мм.гггг)"}
+    search_dict = {}
+    print("Введите границы интервала: пустая строка оставляет границу открытой, 'отмена' возвращает в основное меню")
+    for search_key, input_str in field_map.items():
+        while True:
+            user_input = input(f"{input_str}: ").strip()
+
+            if user_input == "отмена":
+                print("Поиск задач отменен")
+                return {}
+
+            if not user_input:
+                break
+
+            try:
+                search_dict[search_key] = datetime.strptime(user_input, "%d.%m.%Y").date()
+                break
+            except ValueError:
+                print("Некорректный формат даты! Используйте формат дд.мм.гггг")
+
+    if not search_dict:
+        print("Не указаны критерии для поиска задач")
+    return search_dict
+
+
+def search_tasks_due_within() -> Optional[int]:
+    while True:
+        user_input = input("Введите количество дней или введите 'отмена' для возврата в основное меню: ").strip()
+
+        if user_input == "отмена":
+            print("Поиск задач отменен")
+            return None
+
+        if user_input.isdigit():
+            return int(user_input)
+        print("Некорректное количество дней!")
+
+
+def search_tasks(tasks_manager: TaskManager, option: str, page_size: Optional[int] = None) -> None:
+    def show_results(search_dict: Dict) -> None:
+        show_pages(lambda cursor: tasks_manager.search_tasks(**search_dict, limit=page_size, cursor=cursor))
+
+    if option == "4":  # Поиск по нескольким критериям одновременно
+        search_dict = search_tasks_by_fields()
+        if search_dict:
+            show_results(search_dict)
+        return
+
+    if option == "5":  # Поиск по интервалу срока выполнения
+        search_dict = search_tasks_by_due_date()
+        if search_dict:
+            show_results(search_dict)
+        return
+
+    if option == "6":  # Просроченные задачи
+        show_results({"overdue": True})
+        return
+
+    if option == "7":  # Задачи со сроком в ближайшие дни
+        days = search_tasks_due_within()
+        if days is not None:
+            show_results({"due_within": days})
+        return
+
     search_dict = {}
     option_dict = {"1": {"search_key": "keyword", "input_str": "Введите ключевое слово"},
                    "2": {"search_key": "category", "input_str": "Введите категорию"},
@@ -245,5 +386,13 @@ def search_tasks(tasks_manager: TaskManager, option: str) -> None:
             continue
 
         search_dict[option_data["search_key"]] = search_option
-        tasks_manager.search_tasks(**search_dict)
+        show_results(search_dict)
+        return
+
+
+def show_diagnostics(tasks_manager: TaskManager) -> None:
+    if tasks_manager.stats is None:
+        tasks_manager.enable_stats()
+        print("Сбор статистики включен, повторите команду для просмотра")
         return
+    print(tasks_manager.stats.report())
@@ -0,0 +1,105 @@
+import gzip
+import lzma
+import struct
+import sys
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from app.task import PRIORITY_LABELS, STATUS_LABELS, Priority, Status, Task
+
+# Заголовок: сигнатура, версия схемы и способ сжатия остальной части файла
+MAGIC = b"TSKB"
+VERSION = 1
+HEADER = struct.Struct("<4sHB")
+COMPRESSIONS = {None: 0, "gzip": 1, "lzma": 2}
+# Запись задачи после префикса длины: ID, срок (порядковый номер дня), номера категории, приоритета
+# и статуса в таблице строк, длины названия и описания в байтах, затем сами строки в UTF-8
+LENGTH = struct.Struct("<I")
+RECORD = struct.Struct("<QIIIIII")
+
+
+def _compress(body: bytes, compression: Optional[str]) -> bytes:
+    if compression == "gzip":
+        return gzip.compress(body, compresslevel=6)
+    if compression == "lzma":
+        return lzma.compress(body)
+    return body
+
+
+def _decompress(body: bytes, code: int) -> bytes:
+    if code == COMPRESSIONS["gzip"]:
+        return gzip.decompress(body)
+    if code == COMPRESSIONS["lzma"]:
+        return lzma.decompress(body)
+    if code:
+        raise ValueError(f"Неизвестный способ сжатия снимка: {code}")
+    return body
+
+
+def pack_strings(strings: Iterable[str]) -> bytes:
+    """Кодирует таблицу строк: число строк, затем каждая строка в UTF-8 с префиксом длины"""
+    table = []
+    for string in strings:
+        encoded = string.encode("utf-8")
+        table.append(LENGTH.pack(len(encoded)) + encoded)
+    return LENGTH.pack(len(table)) + b"".join(table)
+
+
+def unpack_strings(buffer, offset: int = 0) -> Tuple[List[str], int]:
+    """Декодирует таблицу строк, начинающуюся с offset, и возвращает строки и смещение за таблицей"""
+    (count,), offset = LENGTH.unpack_from(buffer, offset), offset + LENGTH.size
+    strings = []
+    for _ in range(count):
+        (length,), offset = LENGTH.unpack_from(buffer, offset), offset + LENGTH.size
+        strings.append(sys.intern(str(buffer[offset:offset + length], "utf-8")))
+        offset += length
+    return strings, offset
+
+
+def encode_snapshot(tasks: Iterable[Task], compression: Optional[str] = None) -> bytes:
+    """Кодирует задачи в двоичный снимок. Категории, приоритеты и статусы хранятся один раз
+    в таблице строк, а записи ссылаются на них по номеру"""
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"Неизвестный способ сжатия снимка: {compression}")
+    strings: Dict[str, int] = {}
+    records: List[bytes] = []
+    for task in tasks:
+        title, description = task.title.encode("utf-8"), task.description.encode("utf-8")
+        record = RECORD.pack(task.id, task.due_ordinal,
+                             strings.setdefault(task.category, len(strings)),
+                             strings.setdefault(task.priority, len(strings)),
+                             strings.setdefault(task.status, len(strings)),
+                             len(title), len(description)) + title + description
+        records.append(LENGTH.pack(len(record)) + record)
+
+    body = pack_strings(strings) + LENGTH.pack(len(records)) + b"".join(records)
+    return HEADER.pack(MAGIC, VERSION, COMPRESSIONS[compression]) + _compress(body, compression)
+
+
+def decode_snapshot(data: bytes) -> Iterator[Task]:
+    """Последовательно декодирует задачи из двоичного снимка"""
+    if len(data) < HEADER.size:
+        raise ValueError("Файл снимка задач поврежден")
+    magic, version, compression = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("Файл не является двоичным снимком задач")
+    if version > VERSION:
+        raise ValueError(f"Версия снимка {version} не поддерживается")
+    body = memoryview(_decompress(data[HEADER.size:], compression))
+
+    strings, offset = unpack_strings(body)
+    # Коды приоритета и статуса разбираются один раз на каждую строку таблицы
+    priorities = {index: Priority.parse(string) for index, string in enumerate(strings) if string in PRIORITY_LABELS}
+    statuses = {index: Status.parse(string) for index, string in enumerate(strings) if string in STATUS_LABELS}
+
+    (count,), offset = LENGTH.unpack_from(body, offset), offset + LENGTH.size
+    for _ in range(count):
+        (length,) = LENGTH.unpack_from(body, offset)
+        start = offset + LENGTH.size
+        # Длина записи позволяет следующим версиям добавлять поля в конец, не ломая чтение
+        offset = start + length
+        task_id, due, category, priority, status, title_length, description_length = RECORD.unpack_from(body, start)
+        start += RECORD.size
+        title = str(body[start:start + title_length], "utf-8")
+        start += title_length
+        description = str(body[start:start + description_length], "utf-8")
+        yield Task.restore(task_id, title, description, strings[category], due, priorities[priority],
+                           statuses[status])
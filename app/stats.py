@@ -0,0 +1,196 @@
+import cProfile
+import io
+import pstats
+import threading
+import time
+from functools import wraps
+from typing import Callable, Dict
+
+# Операции TaskManager, время выполнения которых замеряется. Полная загрузка задач _load
+# при открытии, перечитывании и выходе из ленивого режима учитывается как операция load
+OPERATIONS = ("_load", "load_tasks", "refresh", "save_tasks", "compact", "flush", "add_task", "edit_task",
+              "update_status", "delete_tasks", "get_task", "get_tasks", "query", "find_tasks", "list_tasks",
+              "search_tasks", "next_tasks")
+
+
+class WriteMeter:
+    """Счетчик байтов, которые текущий поток записывает в файлы и базы хранилищ внутри блока with.
+    Хранилища сообщают ему объем каждой записи, а вне блока учет ничего не делает"""
+
+    _local = threading.local()
+
+    def __init__(self):
+        self.bytes = 0
+        self._outer = None
+
+    def __enter__(self) -> "WriteMeter":
+        self._outer = getattr(self._local, "meter", None)
+        self._local.meter = self
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._local.meter = self._outer
+        if self._outer is not None:
+            self._outer.bytes += self.bytes
+
+    @classmethod
+    def add(cls, size: int) -> None:
+        """Учитывает size записанных байтов в счетчике текущего потока, если он включен"""
+        meter = getattr(cls._local, "meter", None)
+        if meter is not None:
+            meter.bytes += size
+
+
+class Histogram:
+    """Гистограмма значений с корзинами по степеням двойки"""
+
+    def __init__(self):
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, value: float) -> None:
+        """Учитывает значение в гистограмме"""
+        # Корзина k содержит значения из диапазона [2^(k-1), 2^k)
+        bucket = int(value).bit_length()
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def percentile(self, percent: float) -> float:
+        """Возвращает верхнюю границу корзины, в которую попадает процентиль"""
+        rank = self.count * percent / 100
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                return min(2 ** bucket, self.max)
+        return self.max or 0
+
+    def summary(self) -> Dict:
+        """Возвращает сводку значений гистограммы"""
+        return {"count": self.count, "total": self.total, "min": self.min, "max": self.max,
+                "mean": self.total / self.count if self.count else 0,
+                "p50": self.percentile(50), "p99": self.percentile(99),
+                "buckets": {2 ** bucket: count for bucket, count in sorted(self.buckets.items())}}
+
+
+class Stats:
+    """Статистика работы TaskManager: время операций в микросекундах, объем записанных данных,
+    длина просмотра и число результатов запросов. Собирается только после подключения к экземпляру,
+    поэтому без нее методы TaskManager не несут дополнительных расходов"""
+
+    def __init__(self, profile: bool = False):
+        self.latency: Dict[str, Histogram] = {}
+        self.bytes_written = Histogram()
+        self.scanned = Histogram()
+        self.results = Histogram()
+        # Необязательный профилировщик для поиска медленных функций
+        self.profiler = cProfile.Profile() if profile else None
+        self._lock = threading.Lock()
+        self._writing = threading.local()
+        self._manager = None
+
+    def record(self, operation: str, microseconds: float) -> None:
+        """Учитывает время выполнения операции"""
+        with self._lock:
+            self.latency.setdefault(operation, Histogram()).add(microseconds)
+
+    def record_scan(self, scanned: int) -> None:
+        """Учитывает число задач, просматриваемых запросом"""
+        with self._lock:
+            self.scanned.add(scanned)
+
+    def record_results(self, found: int) -> None:
+        """Учитывает число результатов запроса"""
+        with self._lock:
+            self.results.add(found)
+
+    def record_write(self, size: int) -> None:
+        """Учитывает объем данных, записанных в хранилище"""
+        with self._lock:
+            self.bytes_written.add(size)
+
+    def _timed(self, operation: str, method: Callable) -> Callable:
+        @wraps(method)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.record(operation, (time.perf_counter() - start) * 1e6)
+        return wrapper
+
+    def _measured(self, method: Callable) -> Callable:
+        @wraps(method)
+        def wrapper(*args, **kwargs):
+            # write может выполнять запись через save, такая запись учитывается один раз
+            if getattr(self._writing, "active", False):
+                return method(*args, **kwargs)
+            self._writing.active = True
+            try:
+                with WriteMeter() as meter:
+                    result = method(*args, **kwargs)
+            finally:
+                self._writing.active = False
+            self.record_write(meter.bytes)
+            return result
+        return wrapper
+
+    def attach(self, manager) -> None:
+        """Подключает сбор статистики к экземпляру TaskManager, подменяя методы экземпляра"""
+        self._manager = manager
+        for operation in OPERATIONS:
+            setattr(manager, operation, self._timed(operation.lstrip("_"), getattr(manager, operation)))
+        # Загрузка при открытии выполняется до подключения статистики и учитывается по замеру TaskManager
+        if manager.load_time is not None:
+            self.record("load", manager.load_time * 1e6)
+        for method in ("save", "write"):
+            setattr(manager.storage, method, self._measured(getattr(manager.storage, method)))
+        manager.stats = self
+        if self.profiler:
+            self.profiler.enable()
+
+    def detach(self) -> None:
+        """Отключает сбор статистики и восстанавливает исходные методы"""
+        manager, self._manager = self._manager, None
+        if manager is None:
+            return
+        if self.profiler:
+            self.profiler.disable()
+        for operation in OPERATIONS:
+            vars(manager).pop(operation, None)
+        for method in ("save", "write"):
+            vars(manager.storage).pop(method, None)
+        manager.stats = None
+
+    def snapshot(self) -> Dict:
+        """Возвращает собранную статистику в виде словаря"""
+        with self._lock:
+            return {"latency_us": {operation: histogram.summary() for operation, histogram in self.latency.items()},
+                    "bytes_written": self.bytes_written.summary(),
+                    "query_scanned": self.scanned.summary(),
+                    "query_results": self.results.summary()}
+
+    def report(self, profile_limit: int = 15) -> str:
+        """Форматирует статистику для вывода"""
+        snapshot = self.snapshot()
+        lines = ["Время операций (мкс):"]
+        for operation, summary in sorted(snapshot["latency_us"].items()):
+            lines.append(f"  {operation}: вызовов - {summary['count']}, среднее - {summary['mean']:.1f}, "
+                         f"p50 - {summary['p50']:.1f}, p99 - {summary['p99']:.1f}, максимум - {summary['max']:.1f}")
+        for title, key in (("Записано в хранилище (байт)", "bytes_written"),
+                           ("Просмотрено задач при поиске", "query_scanned"),
+                           ("Найдено задач при поиске", "query_results")):
+            summary = snapshot[key]
+            lines.append(f"{title}: операций - {summary['count']}, всего - {summary['total']:.0f}, "
+                         f"среднее - {summary['mean']:.1f}, максимум - {summary['max'] or 0:.0f}")
+        if self.profiler:
+            stream = io.StringIO()
+            pstats.Stats(self.profiler, stream=stream).sort_stats("cumulative").print_stats(profile_limit)
+            lines.append(stream.getvalue())
+        return "\n".join(lines)
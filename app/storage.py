@@ -0,0 +1,582 @@
+import json
+import os
+import sqlite3
+import tempfile
+from contextlib import contextmanager, suppress
+from datetime import date
+from typing import (BinaryIO, ContextManager, Dict, Hashable, Iterable, Iterator, List, Mapping, Optional, TextIO,
+                    Tuple, Union)
+from app.index import FieldIndex
+from app.journal import Journal, append_lines
+from app.snapshot import decode_snapshot, encode_snapshot
+from app.stats import WriteMeter
+from app.task import Task, parse_due_date
+
+try:
+    import fcntl
+except ImportError:  # Windows: рекомендательные блокировки недоступны
+    fcntl = None
+
+# Маска прав процесса: os.umask можно только заменить, поэтому она читается один раз при импорте,
+# а не при каждой записи, когда временная замена повлияла бы на файлы, создаваемые другими потоками
+UMASK = os.umask(0)
+os.umask(UMASK)
+
+
+@contextmanager
+def file_lock(filename: str) -> Iterator[None]:
+    """Удерживает рекомендательную эксклюзивную блокировку файла filename"""
+    if fcntl is None:
+        yield
+        return
+    with open(filename, "a") as file:
+        fcntl.flock(file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(file, fcntl.LOCK_UN)
+
+
+def file_stamp(filename: str) -> Optional[tuple]:
+    """Возвращает отметку версии файла по времени изменения, размеру и inode"""
+    try:
+        stat = os.stat(filename)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+class Storage:
+    """Интерфейс хранилища задач"""
+
+    # Хранилище само выполняет get_task(task_id) и query(keyword, category, status, priority,
+    # due_before, due_after) с результатами по возрастанию ID, поэтому задачи можно не загружать целиком
+    queryable = False
+
+    def load(self) -> Iterator[Task]:
+        """Последовательно загружает сохраненные задачи"""
+        raise NotImplementedError
+
+    def save(self, tasks: Iterable[Task]) -> None:
+        """Сохраняет полный снимок задач"""
+        raise NotImplementedError
+
+    def write(self, records: List[Dict], tasks: Mapping[int, Task]) -> None:
+        """Сохраняет изменения, описанные записями операций.
+        По умолчанию перезаписывает полный снимок задач"""
+        self.save(tasks.values())
+
+    def lock(self) -> ContextManager:
+        """Блокирует хранилище от изменений другими процессами"""
+        return file_lock(f"{self.filename}.lock")
+
+    def stamp(self) -> Hashable:
+        """Возвращает отметку версии данных, которая меняется при каждой записи"""
+        return file_stamp(self.filename)
+
+    def close(self) -> None:
+        """Освобождает ресурсы хранилища"""
+
+
+@contextmanager
+def atomic_write(filename: str, binary: bool = False) -> Iterator[Union[TextIO, BinaryIO]]:
+    """Открывает временный файл рядом с filename и после успешной записи атомарно подменяет им filename.
+    При сбое во время записи прежнее содержимое файла остается нетронутым"""
+    directory = os.path.dirname(os.path.abspath(filename))
+    fd, temp_name = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(filename)}.", suffix=".tmp")
+    try:
+        # mkstemp создает файл с правами 0600: файл получает права прежнего файла,
+        # а новый файл - обычные права open() с учетом маски процесса
+        try:
+            mode = os.stat(filename).st_mode & 0o777
+        except FileNotFoundError:
+            mode = 0o666 & ~UMASK
+        os.chmod(temp_name, mode)
+        with (os.fdopen(fd, "wb") if binary else os.fdopen(fd, "w", encoding="utf-8")) as file:
+            yield file
+            file.flush()
+            os.fsync(file.fileno())
+            WriteMeter.add(os.fstat(file.fileno()).st_size)
+        os.replace(temp_name, filename)
+    except BaseException:
+        with suppress(FileNotFoundError):
+            os.remove(temp_name)
+        raise
+
+
+def apply_record(tasks: Dict[int, Task], record: Dict) -> None:
+    """Применяет запись операции к задачам, повторное применение безопасно"""
+    if record["op"] == "add":
+        task = Task.from_dict(record["task"])
+        tasks[task.id] = task
+    elif record["op"] == "edit":
+        task = tasks.get(record["id"])
+        if task:
+            for field, value in record["fields"].items():
+                setattr(task, field, value)
+    elif record["op"] == "delete":
+        for task_id in record["ids"]:
+            tasks.pop(task_id, None)
+
+
+class JsonStorage(Storage):
+    """Хранилище задач в JSON файле с необязательным журналом операций"""
+
+    def __init__(self, filename: str, journal: bool = False, compact_threshold: int = 1000,
+                 indent: Optional[int] = 4):
+        self.filename = filename
+        # indent=None включает компактную запись без отступов и лишних пробелов
+        self.indent = indent
+        # В режиме журнала изменения дописываются в файл рядом с tasks.json,
+        # а полный снимок перезаписывается только при сжатии журнала
+        self.journaled = journal
+        self.compact_threshold = compact_threshold
+        self.journal = Journal(f"{filename}.log")
+
+    def stamp(self) -> Hashable:
+        """Возвращает отметку версии снимка и журнала"""
+        return file_stamp(self.filename), file_stamp(self.journal.filename)
+
+    def load(self) -> Iterator[Task]:
+        """Загружает задачи из JSON файла и применяет к ним записи журнала"""
+        try:
+            with open(self.filename, "r", encoding="utf-8") as file:
+                tasks = {task.id: task for task in map(Task.from_dict, json.load(file))}
+        except FileNotFoundError:
+            tasks = {}
+        # Журнал мог быть дописан или очищен другим процессом, поэтому его размер пересчитывается
+        self.journal.size = 0
+        for record in self.journal.replay():
+            apply_record(tasks, record)
+            self.journal.size += 1
+        yield from tasks.values()
+
+    def save(self, tasks: Iterable[Task]) -> None:
+        """Сохраняет задачи в JSON файл"""
+        separators = None if self.indent is not None else (",", ":")
+        with atomic_write(self.filename) as file:
+            json.dump([task.to_dict() for task in tasks], file, ensure_ascii=False,
+                      indent=self.indent, separators=separators)
+        # Снимок уже содержит все изменения из журнала
+        if self.journal.size:
+            self.journal.clear()
+
+    def write(self, records: List[Dict], tasks: Mapping[int, Task]) -> None:
+        """Дописывает изменения в журнал или перезаписывает файл целиком"""
+        if not self.journaled:
+            self.save(tasks.values())
+            return
+        for record in records:
+            self.journal.append(record)
+        if self.journal.size >= self.compact_threshold:
+            self.save(tasks.values())
+
+
+class JsonLinesStorage(Storage):
+    """Хранилище задач в формате JSON Lines: одна задача на строку"""
+
+    def __init__(self, filename: str):
+        self.filename = filename
+
+    def load(self) -> Iterator[Task]:
+        """Построчно загружает задачи, не считывая файл целиком"""
+        try:
+            # Обрывок строки может заканчиваться на середине символа UTF-8
+            with open(self.filename, "r", encoding="utf-8", errors="replace") as file:
+                for line in file:
+                    if not line.strip():
+                        continue
+                    try:
+                        data = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Недописанная строка после аварийного завершения пропускается,
+                        # задачи, дописанные после нее, остаются действительными
+                        continue
+                    yield Task.from_dict(data)
+        except FileNotFoundError:
+            return
+
+    def save(self, tasks: Iterable[Task]) -> None:
+        """Построчно записывает задачи в файл"""
+        with atomic_write(self.filename) as file:
+            for task in tasks:
+                file.write(json.dumps(task.to_dict(), ensure_ascii=False, separators=(",", ":")) + "\n")
+
+    def write(self, records: List[Dict], tasks: Mapping[int, Task]) -> None:
+        """Дописывает новые задачи в конец файла, остальные изменения перезаписывают файл"""
+        if any(record["op"] != "add" for record in records):
+            self.save(tasks.values())
+            return
+        append_lines(self.filename, (json.dumps(record["task"], ensure_ascii=False, separators=(",", ":"))
+                                     for record in records))
+
+
+def convert_json_to_jsonl(source: str, target: str) -> None:
+    """Преобразует файл задач из формата JSON в JSON Lines"""
+    JsonLinesStorage(target).save(JsonStorage(source).load())
+
+
+class BinaryStorage(Storage):
+    """Хранилище задач в двоичном снимке с таблицей строк и необязательным сжатием gzip или lzma"""
+
+    def __init__(self, filename: str, compression: Optional[str] = None):
+        self.filename = filename
+        self.compression = compression
+
+    def load(self) -> Iterator[Task]:
+        """Загружает задачи из двоичного снимка"""
+        try:
+            with open(self.filename, "rb") as file:
+                data = file.read()
+        except FileNotFoundError:
+            return
+        yield from decode_snapshot(data)
+
+    def save(self, tasks: Iterable[Task]) -> None:
+        """Сохраняет задачи в двоичный снимок"""
+        data = encode_snapshot(tasks, self.compression)
+        with atomic_write(self.filename, binary=True) as file:
+            file.write(data)
+
+
+def convert_json_to_binary(source: str, target: str, compression: Optional[str] = None) -> None:
+    """Преобразует файл задач из формата JSON в двоичный снимок"""
+    BinaryStorage(target, compression).save(JsonStorage(source).load())
+
+
+def convert_binary_to_json(source: str, target: str, indent: Optional[int] = 4) -> None:
+    """Преобразует двоичный снимок задач в файл JSON"""
+    JsonStorage(target, indent=indent).save(BinaryStorage(source).load())
+
+
+class ShardedStorage(Storage):
+    """Хранилище задач в каталоге: отдельный файл JSON Lines для каждой категории и манифест.
+    Изменения перезаписывают только файлы затронутых категорий, а удаление всех задач
+    категории удаляет ее файл, не трогая остальные"""
+
+    MANIFEST = "manifest.json"
+
+    def __init__(self, directory: str):
+        self.filename = directory
+        self.manifest = os.path.join(directory, self.MANIFEST)
+        # Категория каждой задачи и задачи каждой категории по нормализованному имени категории
+        self._category_of: Dict[int, str] = {}
+        self._shards: Dict[str, set] = {}
+        self._next_id = 1
+        # Признак копий задач, оставшихся после прерванного переноса между категориями
+        self._repair = False
+
+    @staticmethod
+    def shard_name(category: str) -> str:
+        """Возвращает имя файла категории: буквы, цифры, пробел и дефис сохраняются,
+        остальные символы заменяются кодом, поэтому разные категории не совпадают по имени файла"""
+        key = FieldIndex.normalize(category)
+        name = "".join(char if char.isalnum() or char in " -" else f"_{ord(char):06x}" for char in key)
+        return f"{name or '_'}.jsonl"
+
+    def _shard(self, key: str) -> JsonLinesStorage:
+        return JsonLinesStorage(os.path.join(self.filename, key))
+
+    def stamp(self) -> Hashable:
+        """Возвращает отметку версии манифеста, который перезаписывается при каждом изменении"""
+        return file_stamp(self.manifest)
+
+    def _keys(self) -> List[str]:
+        # Файлы категорий в каталоге; временные файлы атомарной записи начинаются с точки
+        try:
+            names = os.listdir(self.filename)
+        except FileNotFoundError:
+            return []
+        return sorted(name for name in names if name.endswith(".jsonl") and not name.startswith("."))
+
+    def load(self) -> Iterator[Task]:
+        """Загружает задачи всех категорий. Список категорий берется из каталога, а не из манифеста,
+        поэтому файл, записанный до сбоя, но не попавший в манифест, не теряется"""
+        try:
+            with open(self.manifest, "r", encoding="utf-8") as file:
+                self._next_id = json.load(file)["next_id"]
+        except FileNotFoundError:
+            self._next_id = 1
+        # Следующий ID берется из манифеста, чтобы ID удаленных категорий не выдавались повторно
+        with Task._counter_lock:
+            Task._counter = max(Task._counter, self._next_id - 1)
+        self._category_of, self._shards = {}, {}
+        strays: Dict[int, Tuple[str, Task]] = {}
+        for key in self._keys():
+            self._shards[key] = set()
+            for task in self._shard(key).load():
+                # Задача в файле чужой категории - копия, оставшаяся после прерванного переноса.
+                # Она используется, только если перенос не успел записать задачу в файл ее категории
+                if self.shard_name(task.category) != key or task.id in self._category_of:
+                    strays.setdefault(task.id, (key, task))
+                    continue
+                self._register(key, task)
+                yield task
+        for task_id, (key, task) in strays.items():
+            if task_id not in self._category_of:
+                self._register(key, task)
+                yield task
+        # Следующая запись перезаписывает каталог целиком и удаляет оставшиеся копии
+        self._repair = bool(strays)
+
+    def _register(self, key: str, task: Task) -> None:
+        self._shards[key].add(task.id)
+        self._category_of[task.id] = key
+        self._next_id = max(self._next_id, task.id + 1)
+
+    def load_category(self, category: str) -> Iterator[Task]:
+        """Загружает задачи одной категории, читая только ее файл"""
+        return self._shard(self.shard_name(category)).load()
+
+    def save(self, tasks: Iterable[Task]) -> None:
+        """Перезаписывает файлы всех категорий"""
+        shards: Dict[str, Dict[int, Task]] = {}
+        for task in tasks:
+            shards.setdefault(self.shard_name(task.category), {})[task.id] = task
+        os.makedirs(self.filename, exist_ok=True)
+        # Задачи, сменившие категорию, остаются в прежнем файле до записи нового
+        leaving: Dict[str, Dict[int, Task]] = {}
+        for key, shard in shards.items():
+            for task_id, task in shard.items():
+                old = self._category_of.get(task_id)
+                if old is not None and old != key:
+                    leaving.setdefault(old, {})[task_id] = task
+        for key in shards.keys() | leaving.keys():
+            self._shard(key).save({**shards.get(key, {}), **leaving.get(key, {})}.values())
+        self._shards = {key: set(shard) for key, shard in shards.items()}
+        self._category_of = {task_id: key for key, ids in self._shards.items() for task_id in ids}
+        self._save_manifest(max(self._category_of, default=0) + 1)
+        for key in leaving.keys() & shards.keys():
+            self._shard(key).save(shards[key].values())
+        for key in set(self._keys()) - set(shards):
+            with suppress(FileNotFoundError):
+                os.remove(os.path.join(self.filename, key))
+        self._repair = False
+
+    def write(self, records: List[Dict], tasks: Mapping[int, Task]) -> None:
+        """Перезаписывает только файлы категорий, затронутых изменениями. Новые задачи
+        дописываются в конец файла, а задача со смененной категорией переносится в файл новой категории.
+        Порядок записи не теряет задачи при сбое: сначала записываются файлы, получающие задачи,
+        затем манифест со следующим ID и только потом файлы, из которых задачи удаляются"""
+        if self._repair:  # Каталог содержит копии задач после прерванного переноса
+            self.save(tasks.values())
+            return
+        os.makedirs(self.filename, exist_ok=True)
+        # Записи каждой затронутой категории: только добавления позволяют дописать файл
+        changed: Dict[str, List[Dict]] = {}
+        # ID задач, перенесенных из каждой категории в другие
+        leaving: Dict[str, set] = {}
+        next_id = self._next_id
+        for record in records:
+            if record["op"] == "add":
+                task_id = record["task"]["id"]
+                self._move(task_id, self.shard_name(record["task"]["category"]), changed, leaving)
+                changed[self._category_of[task_id]].append(record)
+                next_id = max(next_id, task_id + 1)
+            elif record["op"] == "edit" and record["id"] in self._category_of:
+                key = self._category_of[record["id"]]
+                if "category" in record["fields"]:
+                    key = self.shard_name(record["fields"]["category"])
+                self._move(record["id"], key, changed, leaving)
+                changed[key].append(record)
+            elif record["op"] == "delete":
+                for task_id in record["ids"]:
+                    self._move(task_id, None, changed, leaving)
+
+        # Сначала записываются файлы, получающие или изменяющие задачи. Файлы, из которых задачи
+        # перенесены, пока сохраняют их новые версии, поэтому при сбое задача остается хотя бы в одном файле
+        shrinking = []
+        for key, shard_records in changed.items():
+            ids = self._shards.get(key, set())
+            only_deletes = all(record["op"] == "delete" for record in shard_records)
+            if key in leaving or not ids or only_deletes:
+                shrinking.append(key)
+            if key in leaving or (ids and not only_deletes):
+                self._shard(key).write(shard_records, {task_id: tasks[task_id]
+                                                       for task_id in sorted(ids | leaving.get(key, set()))})
+        self._save_manifest(next_id)
+        # Затем из файлов удаляются перенесенные и удаленные задачи
+        for key in shrinking:
+            ids = self._shards.get(key)
+            if not ids:
+                self._shards.pop(key, None)
+                with suppress(FileNotFoundError):
+                    os.remove(os.path.join(self.filename, key))
+            else:
+                self._shard(key).save(tasks[task_id] for task_id in sorted(ids))
+
+    def _move(self, task_id: int, key: Optional[str], changed: Dict[str, List[Dict]],
+              leaving: Dict[str, set]) -> None:
+        # Переносит задачу в категорию key или удаляет ее при key=None, отмечая затронутые категории
+        old = self._category_of.pop(task_id, None)
+        # Задача, уже перенесенная этой записью, сохраняется только в файле исходной категории:
+        # повторный перенос не делает исходным промежуточный файл, а удаленная задача не сохраняется нигде
+        origin = next((source for source, ids in leaving.items() if task_id in ids), old)
+        for ids in leaving.values():
+            ids.discard(task_id)
+        if key is not None and origin is not None and origin != key:
+            leaving.setdefault(origin, set()).add(task_id)
+        if old is not None and old != key:
+            self._shards[old].discard(task_id)
+            # Удаление задачи из файла требует его перезаписи
+            changed.setdefault(old, []).append({"op": "delete", "ids": [task_id]})
+        if key is not None:
+            self._category_of[task_id] = key
+            self._shards.setdefault(key, set()).add(task_id)
+            changed.setdefault(key, [])
+
+    def _save_manifest(self, next_id: int) -> None:
+        self._next_id = max(self._next_id, next_id)
+        with atomic_write(self.manifest) as file:
+            json.dump({"next_id": self._next_id}, file)
+
+
+class SqliteStorage(Storage):
+    """Хранилище задач в базе SQLite: каждое изменение затрагивает только свои строки,
+    а поиск и получение задачи по ID выполняются запросами к базе"""
+
+    queryable = True
+    COLUMNS = ("id", "title", "description", "category", "due_date", "priority", "status")
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self.connection = sqlite3.connect(filename, check_same_thread=False)
+        self.connection.create_function("lower_text", 1, str.lower, deterministic=True)
+        with self.connection:
+            self.connection.executescript("""
+                CREATE TABLE IF NOT EXISTS tasks (
+                    id INTEGER PRIMARY KEY,
+                    title TEXT NOT NULL,
+                    description TEXT NOT NULL,
+                    category TEXT NOT NULL,
+                    category_key TEXT NOT NULL,
+                    due_date TEXT NOT NULL,
+                    due_ordinal INTEGER NOT NULL,
+                    priority TEXT NOT NULL,
+                    status TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS tasks_category ON tasks (category_key);
+                CREATE INDEX IF NOT EXISTS tasks_status ON tasks (status);
+                CREATE INDEX IF NOT EXISTS tasks_priority ON tasks (priority);
+                CREATE INDEX IF NOT EXISTS tasks_due ON tasks (due_ordinal);
+            """)
+
+    def _row(self, task: Dict) -> Dict:
+        """Дополняет словарь задачи вычисляемыми индексируемыми столбцами"""
+        row = dict(task, category_key=task["category"].casefold(), due_ordinal=parse_due_date(task["due_date"]))
+        WriteMeter.add(self._size(row.values()))
+        return row
+
+    @staticmethod
+    def _size(values: Iterable) -> int:
+        # Объем записываемых значений: число страниц, которые при этом записывает SQLite, модуль sqlite3 не сообщает
+        return sum(len(value.encode("utf-8")) if isinstance(value, str) else 8 for value in values)
+
+    def _select(self, where: str = "", params: Iterable = ()) -> Iterator[Task]:
+        cursor = self.connection.execute(f"SELECT {', '.join(self.COLUMNS)} FROM tasks {where} ORDER BY id", params)
+        for row in cursor:
+            yield Task.from_dict(dict(zip(self.COLUMNS, row)))
+
+    def load(self) -> Iterator[Task]:
+        """Построчно загружает задачи из базы"""
+        return self._select()
+
+    def save(self, tasks: Iterable[Task]) -> None:
+        """Заменяет содержимое базы полным снимком задач"""
+        with self.connection:
+            self.connection.execute("DELETE FROM tasks")
+            self.connection.executemany(
+                "INSERT INTO tasks VALUES (:id, :title, :description, :category, :category_key, "
+                ":due_date, :due_ordinal, :priority, :status)",
+                (self._row(task.to_dict()) for task in tasks)
+            )
+
+    def write(self, records: List[Dict], tasks: Mapping[int, Task]) -> None:
+        """Применяет изменения построчными INSERT/UPDATE/DELETE в одной транзакции"""
+        with self.connection:
+            for record in records:
+                if record["op"] == "add":
+                    self.connection.execute(
+                        "INSERT OR REPLACE INTO tasks VALUES (:id, :title, :description, :category, :category_key, "
+                        ":due_date, :due_ordinal, :priority, :status)",
+                        self._row(record["task"])
+                    )
+                elif record["op"] == "edit":
+                    fields = {field: value for field, value in record["fields"].items() if field in self.COLUMNS}
+                    if "category" in fields:
+                        fields["category_key"] = fields["category"].casefold()
+                    if "due_date" in fields:
+                        fields["due_ordinal"] = parse_due_date(fields["due_date"])
+                    assignments = ", ".join(f"{field} = :{field}" for field in fields)
+                    WriteMeter.add(self._size(fields.values()))
+                    self.connection.execute(f"UPDATE tasks SET {assignments} WHERE id = :task_id",
+                                            dict(fields, task_id=record["id"]))
+                elif record["op"] == "delete":
+                    WriteMeter.add(self._size(record["ids"]))
+                    self.connection.executemany("DELETE FROM tasks WHERE id = ?",
+                                                ((task_id,) for task_id in record["ids"]))
+
+    def get_task(self, task_id: int) -> Optional[Task]:
+        """Получает задачу по ID запросом по первичному ключу"""
+        return next(self._select("WHERE id = ?", (task_id,)), None)
+
+    def query(self, keyword: Optional[str] = None,
+              category: Optional[str] = None,
+              status: Optional[str] = None,
+              priority: Optional[str] = None,
+              due_before: Optional[date] = None,
+              due_after: Optional[date] = None) -> List[Task]:
+        """Выполняет поиск задач средствами SQL по индексированным столбцам"""
+        conditions, params = [], []
+        if category:
+            conditions.append("category_key = ?")
+            params.append(category.casefold())
+        if status:
+            conditions.append("status = ?")
+            params.append(status.lower())
+        if priority:
+            conditions.append("priority = ?")
+            params.append(priority.lower())
+        if due_before:
+            conditions.append("due_ordinal <= ?")
+            params.append(due_before.toordinal())
+        if due_after:
+            conditions.append("due_ordinal >= ?")
+            params.append(due_after.toordinal())
+        if keyword:
+            conditions.append("(instr(lower_text(title), ?) > 0 OR instr(lower_text(description), ?) > 0)")
+            params.extend([keyword.lower()] * 2)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        return list(self._select(where, params))
+
+    def stamp(self) -> Hashable:
+        """Возвращает номер версии данных, который меняется после записи из другого соединения"""
+        return self.connection.execute("PRAGMA data_version").fetchone()[0]
+
+    def close(self) -> None:
+        """Закрывает соединение с базой"""
+        self.connection.close()
+
+
+def open_storage(filename: str, compression: Optional[str] = None, **options) -> Storage:
+    """Создает хранилище по расширению файла: .db/.sqlite - SQLite, .jsonl - JSON Lines,
+    .bin - двоичный снимок, .tsm - файл, отображаемый в память, каталог - файлы по категориям, иначе JSON"""
+    if os.path.isdir(filename) or filename.endswith(("/", os.sep)):
+        return ShardedStorage(filename.rstrip("/" + os.sep))
+    base, extension = os.path.splitext(filename)
+    if extension in (".db", ".sqlite", ".sqlite3"):
+        return SqliteStorage(filename)
+    if extension == ".tsm":
+        from app.mapped_store import MappedTaskStore  # Модуль сам зависит от app.storage
+        return MappedTaskStore(filename)
+    if extension == ".bin":
+        # Существующий файл tasks.json рядом автоматически переводится в двоичный формат
+        if not os.path.exists(filename) and os.path.exists(f"{base}.json"):
+            convert_json_to_binary(f"{base}.json", filename, compression)
+        return BinaryStorage(filename, compression)
+    if extension == ".jsonl":
+        # Существующий файл tasks.json рядом автоматически переводится в новый формат
+        if not os.path.exists(filename) and os.path.exists(f"{base}.json"):
+            convert_json_to_jsonl(f"{base}.json", filename)
+        return JsonLinesStorage(filename)
+    return JsonStorage(filename, **options)
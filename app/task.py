@@ -1,30 +1,165 @@
-from typing import Dict
+import sys
+import threading
+from datetime import date
+from enum import IntEnum
+from typing import Dict, Union
+
+PRIORITY_LABELS = ("низкий", "средний", "высокий")
+STATUS_LABELS = ("не выполнена", "выполнена")
+
+
+def parse_due_date(value: str) -> int:
+    """Преобразует срок в формате дд.мм.гггг в порядковый номер дня"""
+    try:
+        day, month, year = value.split(".")
+        return date(int(year), int(month), int(day)).toordinal()
+    except ValueError:
+        raise ValueError(f"Некорректный срок выполнения задачи: {value}") from None
+
+
+def format_due_date(ordinal: int) -> str:
+    """Преобразует порядковый номер дня в срок в формате дд.мм.гггг"""
+    return f"{date.fromordinal(ordinal):%d.%m.%Y}"
+
+
+class Priority(IntEnum):
+    """Приоритет задачи, хранится как небольшой целочисленный код"""
+    LOW = 0
+    MEDIUM = 1
+    HIGH = 2
+
+    @property
+    def label(self) -> str:
+        return PRIORITY_LABELS[self]
+
+    @classmethod
+    def parse(cls, value: Union[str, "Priority"]) -> "Priority":
+        """Преобразует название приоритета в код"""
+        if isinstance(value, cls):
+            return value
+        try:
+            return cls(PRIORITY_LABELS.index(value.lower()))
+        except ValueError:
+            raise ValueError(f"Некорректный приоритет задачи: {value}") from None
+
+
+class Status(IntEnum):
+    """Статус задачи, хранится как небольшой целочисленный код"""
+    OPEN = 0
+    DONE = 1
+
+    @property
+    def label(self) -> str:
+        return STATUS_LABELS[self]
+
+    @classmethod
+    def parse(cls, value: Union[str, "Status"]) -> "Status":
+        """Преобразует название статуса в код"""
+        if isinstance(value, cls):
+            return value
+        try:
+            return cls(STATUS_LABELS.index(value.lower()))
+        except ValueError:
+            raise ValueError(f"Некорректный статус задачи: {value}") from None
 
 
 class Task:
+    # Без __dict__ у каждого экземпляра, приоритет и статус хранятся кодами,
+    # а одинаковые категории разделяют один интернированный объект строки.
+    # Срок хранится порядковым номером дня, чтобы сравнивать даты без разбора строк.
+    # В _text кэшируется представление задачи для вывода
+    __slots__ = ("id", "_title", "_description", "_category", "_due", "_priority", "_status", "_text")
+
     _counter = 0
+    # Выдача ID атомарна при создании задач из нескольких потоков
+    _counter_lock = threading.Lock()
 
     def __init__(self, title: str, description: str, category: str, due_date: str,
                  priority: str, task_id: int = None, status: str = "не выполнена"):
-        if task_id is None:
-            Task._counter += 1
-            self.id = Task._counter
-        else:
-            self.id = task_id
-            Task._counter = max(Task._counter, task_id)
-        self.title = title
-        self.description = description
+        with Task._counter_lock:
+            if task_id is None:
+                Task._counter += 1
+                self.id = Task._counter
+            else:
+                self.id = task_id
+                Task._counter = max(Task._counter, task_id)
+        self._title = title
+        self._description = description
+        self._text = None
         self.category = category
         self.due_date = due_date
         self.priority = priority
         self.status = status
 
+    # Изменение любого отображаемого поля сбрасывает кэшированное представление задачи
+    @property
+    def title(self) -> str:
+        return self._title
+
+    @title.setter
+    def title(self, value: str) -> None:
+        self._title = value
+        self._text = None
+
+    @property
+    def description(self) -> str:
+        return self._description
+
+    @description.setter
+    def description(self, value: str) -> None:
+        self._description = value
+        self._text = None
+
+    @property
+    def category(self) -> str:
+        return self._category
+
+    @category.setter
+    def category(self, value: str) -> None:
+        self._category = sys.intern(value)
+        self._text = None
+
+    @property
+    def due_date(self) -> str:
+        return format_due_date(self._due)
+
+    @due_date.setter
+    def due_date(self, value: str) -> None:
+        self._due = parse_due_date(value)
+        self._text = None
+
+    @property
+    def due_ordinal(self) -> int:
+        """Срок выполнения как порядковый номер дня"""
+        return self._due
+
+    @property
+    def priority(self) -> str:
+        return PRIORITY_LABELS[self._priority]
+
+    @priority.setter
+    def priority(self, value: Union[str, Priority]) -> None:
+        self._priority = Priority.parse(value)
+        self._text = None
+
+    @property
+    def status(self) -> str:
+        return STATUS_LABELS[self._status]
+
+    @status.setter
+    def status(self, value: Union[str, Status]) -> None:
+        self._status = Status.parse(value)
+        self._text = None
+
     def present_task(self) -> str:
         """Форматирует задачу для вывода"""
-        padding = " " * len(f"ID: {self.id}, ")
-        return (f"ID: {self.id}, Название: {self.title}, Категория: {self.category}\n"
-                f"{padding}Описание: {self.description}\n"
-                f"{padding}Срок: {self.due_date}, Приоритет: {self.priority}, Статус: {self.status}")
+        if self._text is None:
+            padding = " " * len(f"ID: {self.id}, ")
+            self._text = (f"ID: {self.id}, Название: {self.title}, Категория: {self.category}\n"
+                          f"{padding}Описание: {self.description}\n"
+                          f"{padding}Срок: {self.due_date}, Приоритет: {self._priority.label}, "
+                          f"Статус: {self._status.label}")
+        return self._text
 
     def to_dict(self) -> Dict:
         """Преобразует объект задачи в словарь для сохранения в JSON"""
@@ -34,10 +169,28 @@ class Task:
             "description": self.description,
             "category": self.category,
             "due_date": self.due_date,
-            "priority": self.priority,
-            "status": self.status,
+            "priority": self._priority.label,
+            "status": self._status.label,
         }
 
+    @classmethod
+    def restore(cls, task_id: int, title: str, description: str, category: str, due_ordinal: int,
+                priority: Priority, status: Status) -> "Task":
+        """Создает задачу из уже проверенных значений без разбора строк, например при чтении двоичного снимка"""
+        task = cls.__new__(cls)
+        task.id = task_id
+        task._title = title
+        task._description = description
+        task._category = category
+        task._due = due_ordinal
+        task._priority = priority
+        task._status = status
+        task._text = None
+        with Task._counter_lock:
+            if task_id > Task._counter:
+                Task._counter = task_id
+        return task
+
     @staticmethod
     def from_dict(data: Dict) -> "Task":
         """Создает объект задачи из словаря"""
@@ -1,137 +1,735 @@
-import json
-from typing import List, Optional
+import atexit
+import sys
+import threading
+import time
+from bisect import bisect_right
+from itertools import chain, islice
+from collections import Counter
+from contextlib import contextmanager
+from datetime import date, timedelta
+from functools import partial, wraps
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from app.cache import CacheInfo, QueryCache
+from app.index import Agenda, DueIndex, FieldIndex, SortedIds, TrigramIndex
+from app.locks import NoLock, RWLock
+from app.stats import Stats
+from app.storage import Storage, apply_record, open_storage
 from app.task import Task
+from app.write_behind import WriteBehind
+
+
+def mutation(method: Optional[Callable] = None, *, allocates: bool = False) -> Callable:
+    """Выполняет изменяющий метод TaskManager с проверкой актуальности данных в хранилище.
+    Исключительная блокировка удерживается только на время изменения данных в памяти.
+    allocates=True отмечает методы, выдающие новые ID задач"""
+    if method is None:
+        return partial(mutation, allocates=allocates)
+
+    @wraps(method)
+    def wrapper(self: "TaskManager", *args, **kwargs):
+        self._materialize()
+        with self._mutation(allocates) as sync:
+            with self._rwlock.write():
+                result = method(self, *args, **kwargs)
+            if self.autoflush or sync:
+                self._flush(direct=sync)
+        return result
+    return wrapper
+
+
+def write_lines(header: str, lines: Iterable[str], chunk_size: int = 256) -> None:
+    """Выводит заголовок и строки блоками по chunk_size строк одной записью в sys.stdout.
+    Вывод совпадает с построчным print, но без отдельной записи на каждую строку"""
+    stream = sys.stdout
+    stream.write(header + "\n")
+    chunk = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) == chunk_size:
+            stream.write("\n".join(chunk) + "\n")
+            chunk.clear()
+    if chunk:
+        stream.write("\n".join(chunk) + "\n")
+
+
+def reading(method: Optional[Callable] = None, *, lazy: bool = False) -> Callable:
+    """Выполняет читающий метод TaskManager под разделяемой блокировкой.
+    lazy=True отмечает методы, которые в ленивом режиме выполняет само хранилище без загрузки всех задач"""
+    if method is None:
+        return partial(reading, lazy=lazy)
+
+    @wraps(method)
+    def wrapper(self: "TaskManager", *args, **kwargs):
+        if not lazy:
+            self._materialize()
+        with self._rwlock.read():
+            return method(self, *args, **kwargs)
+    return wrapper
 
 
 class TaskManager:
-    def __init__(self, filename: str):
+    def __init__(self, filename: str, journal: bool = False, compact_threshold: int = 1000,
+                 indent: Optional[int] = 4, compression: Optional[str] = None, storage: Optional[Storage] = None,
+                 write_behind: bool = False, max_staleness: float = 1.0, max_pending: int = 1000,
+                 shared: bool = False, thread_safe: bool = False, verbose: bool = True, autoflush: bool = True,
+                 query_cache: int = 128, lazy: bool = False):
         self.filename = filename
-        self.tasks: List[Task] = self.load_tasks()
+        # Формат хранения определяется расширением файла, если хранилище не передано явно
+        # Пустое хранилище с __len__ ложно в логическом контексте, поэтому сравнивается с None
+        self.storage = storage if storage is not None else open_storage(
+            filename, compression=compression, journal=journal, compact_threshold=compact_threshold, indent=indent)
+        # Признак изменений в памяти, которые еще не записаны в хранилище
+        self._dirty = False
+        # Короткая блокировка структуры self._tasks и очереди несохраненных записей,
+        # под ней снимается копия задач для записи на диск
+        self._lock = threading.Lock()
+        self._unsaved: List[Dict] = []
+        # При autoflush=False изменения остаются в памяти до явного вызова flush()
+        self.autoflush = autoflush
+        # При verbose=False сообщения об операциях не выводятся, результаты возвращаются методами
+        self.verbose = verbose
+        # В потокобезопасном режиме читатели работают параллельно, а писатели исключительно
+        # только на время изменения данных в памяти. Записи на диск упорядочивает self._io_lock
+        self.thread_safe = thread_safe
+        self._rwlock = RWLock() if thread_safe else NoLock()
+        self._io_lock = threading.Lock()
+        # Состояние пакетной операции: отложенные записи, журнал отмены и счетчики для итогового сообщения
+        self._pending: Optional[List[Dict]] = None
+        self._batch_thread: Optional[int] = None
+        self._undo: Optional[List] = None
+        self._summary: Counter = Counter()
+        # В режиме совместного доступа перед каждым изменением проверяется, не изменил ли
+        # хранилище другой процесс, и при необходимости задачи перечитываются
+        self.shared = shared
+        self._reload_needed = False
+        # Кэш результатов поиска; поколение данных увеличивается при каждом изменении задач,
+        # поэтому результаты прошлых поколений в кэше никогда не используются
+        self._cache = QueryCache(maxsize=query_cache)
+        self._generation = 0
+        # Статистика операций, собирается только после вызова enable_stats()
+        self.stats: Optional[Stats] = None
+        # Длительность последней полной загрузки задач в секундах, учитывается статистикой
+        self.load_time: Optional[float] = None
+        # В ленивом режиме задачи не загружаются при открытии, если хранилище само выполняет
+        # get_task и query. Все задачи с индексами загружаются при первой операции другого вида
+        self._loaded = False
+        if lazy and self.storage.queryable:
+            self._stamp = self.storage.stamp()
+        else:
+            self._load()
+        # В режиме отложенной записи изменения сохраняет фоновый поток, а оставшиеся
+        # изменения гарантированно записываются при закрытии и завершении программы
+        self._writer = None
+        if write_behind:
+            self._writer = WriteBehind(self._write_behind, max_staleness=max_staleness, max_pending=max_pending)
+            atexit.register(self.close)
+
+    @property
+    def tasks(self) -> List[Task]:
+        """Список всех задач"""
+        self._materialize()
+        with self._rwlock.read():
+            return list(self._tasks.values())
+
+    @reading
+    def has_tasks(self) -> bool:
+        """Проверяет, есть ли задачи, без копирования их списка"""
+        return bool(self._tasks)
 
     def load_tasks(self) -> List[Task]:
-        """Загружает задачи из JSON файла"""
+        """Загружает задачи из хранилища"""
+        return list(self.storage.load())
+
+    def _load(self) -> None:
+        """Строит индексы задач по данным хранилища"""
+        start = time.perf_counter()
+        self._stamp = self.storage.stamp()
+        self._generation += 1
+        # Индекс задач по ID, порядок вставки совпадает с порядком задач в файле
+        self._tasks: Dict[int, Task] = {}
+        # Возрастающий список ID для постраничного перебора всех задач
+        self._ids = SortedIds()
+        self._by_category = FieldIndex("category")
+        self._by_status = FieldIndex("status")
+        self._by_priority = FieldIndex("priority")
+        self._by_text = TrigramIndex()
+        self._indexes = [self._by_category, self._by_status, self._by_priority, self._by_text]
+        # Задачи добавляются в индексы по мере чтения, без промежуточного списка
+        for task in self.storage.load():
+            self._insert(task)
+        # Упорядоченный индекс сроков и очередь ближайших задач строятся целиком после загрузки
+        self._by_due = DueIndex(self._tasks.values())
+        self._agenda = Agenda(self._tasks.values())
+        self._indexes += [self._by_due, self._agenda]
+        self._loaded = True
+        self.load_time = time.perf_counter() - start
+
+    def _materialize(self) -> None:
+        """Загружает все задачи и строит индексы, если ленивый режим еще не загрузил их"""
+        if not self._loaded:
+            with self._rwlock.write():
+                if not self._loaded:
+                    self._load()
+
+    def refresh(self) -> bool:
+        """Перечитывает задачи, если хранилище изменил другой процесс"""
+        if not self._stale():
+            return False
+        if self._writer:
+            # Свои отложенные изменения сначала объединяются с данными другого процесса
+            self._writer.flush()
+        self._reload()
+        return True
+
+    def _stale(self) -> bool:
+        """Проверяет, изменилось ли хранилище после последней загрузки или записи"""
+        return self._reload_needed or self.storage.stamp() != self._stamp
+
+    def _reload(self) -> None:
+        self._reload_needed = False
+        with self._rwlock.write():
+            self._load()
+
+    @contextmanager
+    def _mutation(self, allocates: bool = False) -> Iterator[bool]:
+        """Подготавливает изменение задач в режиме совместного доступа: перечитывает устаревшие данные
+        и на время изменения и записи удерживает блокировку хранилища. Возвращает True, если изменения
+        нужно записать до снятия блокировки хранилища"""
+        if not self.shared or self._in_batch():
+            yield False
+            return
+        if self._writer and not allocates:
+            # Фоновый поток сам берет блокировку на время записи и объединяет изменения по ID задач
+            self.refresh()
+            yield False
+            return
+        if self._writer:
+            # Новые ID выдаются и записываются под блокировкой хранилища, иначе другой процесс
+            # успел бы выдать тот же ID своей задаче до фоновой записи. Отложенные изменения
+            # записываются заранее, потому что фоновый поток сам берет блокировку хранилища
+            self._writer.flush()
+        with self.storage.lock():
+            if self._stale():
+                self._reload()
+            yield allocates
+
+    def _insert(self, task: Task) -> None:
+        """Добавляет задачу в хранилище и во все индексы"""
+        with self._lock:
+            self._tasks[task.id] = task
+        self._generation += 1
+        self._ids.add(task.id)
+        for index in self._indexes:
+            index.add(task)
+        if self._undo is not None:
+            self._undo.append(lambda: self._remove(task))
+
+    def _remove(self, task: Task) -> None:
+        """Удаляет задачу из хранилища и из всех индексов"""
+        with self._lock:
+            del self._tasks[task.id]
+        self._generation += 1
+        self._ids.remove(task.id)
+        for index in self._indexes:
+            index.remove(task)
+        if self._undo is not None:
+            self._undo.append(lambda: self._insert(task))
+
+    def _remove_many(self, tasks: List[Task]) -> None:
+        """Удаляет несколько задач: упорядоченные индексы перестраиваются одним проходом,
+        а не сдвигаются на каждую удаленную задачу"""
+        with self._lock:
+            for task in tasks:
+                del self._tasks[task.id]
+        self._generation += 1
+        self._ids.remove_many({task.id for task in tasks})
+        for index in self._indexes:
+            index.remove_many(tasks)
+        if self._undo is not None:
+            self._undo.append(lambda: [self._insert(task) for task in tasks])
+
+    def _update(self, task: Task, fields: Dict) -> None:
+        """Изменяет поля задачи и обновляет только затронутые индексы.
+        Если значение какого-либо поля некорректно, задача остается без изменений"""
+        previous = {field: getattr(task, field) for field in fields}
+        indexes = [index for index in self._indexes if not index.fields.isdisjoint(fields)]
+        self._generation += 1
+        for index in indexes:
+            index.remove(task)
         try:
-            with open(self.filename, "r", encoding="utf-8") as file:
-                tasks = json.load(file)
-                return [Task.from_dict(task) for task in tasks]
-        except FileNotFoundError:
-            return []
+            for field, value in fields.items():
+                setattr(task, field, value)
+        except ValueError:
+            # Уже измененные поля возвращаются к прежним значениям
+            for field, value in previous.items():
+                setattr(task, field, value)
+            raise
+        finally:
+            # Индексы остаются согласованными, даже если значение поля некорректно
+            for index in indexes:
+                index.add(task)
+        if self._undo is not None:
+            self._undo.append(lambda: self._update(task, previous))
 
     def save_tasks(self) -> None:
-        """Сохраняет задачи в JSON файл"""
-        with open(self.filename, "w", encoding="utf-8") as file:
-            json.dump([task.to_dict() for task in self.tasks], file, ensure_ascii=False, indent=4)
+        """Сохраняет все задачи в хранилище, если есть несохраненные изменения"""
+        if not self._dirty or self._in_batch():  # Изменения пакета сохраняются по его завершении
+            return
+        if self._writer:
+            self._writer.flush()
+            self._dirty = False
+        else:
+            self.compact()
+
+    def compact(self) -> None:
+        """Переносит журнал операций в новый снимок задач"""
+        # Снимок не должен включать незавершенный пакет, а без загруженных задач переносить нечего
+        if self._in_batch() or not self._loaded:
+            return
+        if self._writer:
+            self._writer.flush()
+        # В режиме совместного доступа снимок записывается под блокировкой хранилища
+        # по данным, перечитанным после изменений других процессов, как и пакетная операция
+        with self._mutation(allocates=True):
+            with self._io_lock:
+                # Полный снимок включает и еще не записанные изменения
+                with self._lock:
+                    self._unsaved = []
+                self.storage.save((self._snapshot() if self.thread_safe else self._tasks).values())
+                if self.shared:
+                    self._stamp = self.storage.stamp()
+                self._dirty = False
 
-    def add_task(self, title: str, description: str, category: str, due_date: str, priority: str):
+    def close(self) -> None:
+        """Записывает отложенные изменения и закрывает хранилище задач"""
+        self._flush()
+        if self._writer:
+            self._writer.close()
+            atexit.unregister(self.close)
+        self.storage.close()
+
+    def _persist(self, record: Dict) -> None:
+        """Передает изменение в хранилище, внутри пакетной операции откладывает его до завершения"""
+        self._dirty = True
+        if self._pending is not None:
+            self._pending.append(record)
+        else:
+            with self._lock:
+                self._unsaved.append(record)
+
+    def flush(self) -> None:
+        """Записывает накопленные изменения в хранилище"""
+        self._flush()
+
+    def _flush(self, direct: bool = False) -> None:
+        """Записывает накопленные изменения в хранилище или передает их фоновому потоку.
+        При direct=True изменения записываются сразу, даже в режиме отложенной записи"""
+        if self._in_batch():  # Изменения, накопленные до пакета, записываются вместе с ним
+            return
+        with self._io_lock:
+            with self._lock:
+                records, self._unsaved = self._unsaved, []
+            if not records:
+                return
+            if self._writer and not direct:
+                for record in records:
+                    self._writer.put(record)
+                return
+            # Другие потоки могут менять задачи во время записи, поэтому записывается копия набора задач
+            self.storage.write(records, self._snapshot() if self.thread_safe else self._tasks)
+            if self.shared:
+                self._stamp = self.storage.stamp()
+            self._dirty = bool(self._unsaved)
+
+    def _snapshot(self) -> Dict[int, Task]:
+        """Возвращает копию набора задач для записи без удержания блокировок. Копия снимается
+        под блокировкой чтения, поэтому не включает задачи пакета, открытого в другом потоке"""
+        with self._rwlock.read():
+            with self._lock:
+                return dict(self._tasks)
+
+    def _write_behind(self, records: List[Dict]) -> None:
+        """Записывает изменения из фонового потока по копии текущего набора задач"""
+        tasks = self._snapshot()
+        if not self.shared:
+            self.storage.write(records, tasks)
+            return
+        with self.storage.lock():
+            if self.storage.stamp() != self._stamp:
+                self.storage.save(self._merge(records).values())
+                self._reload_needed = True
+            else:
+                self.storage.write(records, tasks)
+            self._stamp = self.storage.stamp()
+
+    def _merge(self, records: List[Dict]) -> Dict[int, Task]:
+        """Применяет свои изменения по ID задач к данным, которые изменил другой процесс"""
+        # Новые задачи записываются сразу под блокировкой хранилища, поэтому отложенные записи
+        # ссылаются только на ID, уже известные другим процессам
+        tasks = {task.id: task for task in self.storage.load()}
+        for record in records:
+            apply_record(tasks, record)
+        return tasks
+
+    def _report(self, message: str, kind: str, count: int = 1) -> None:
+        """Выводит сообщение об операции, внутри пакетной операции только учитывает его в итогах"""
+        if self._pending is not None:
+            self._summary[kind] += count
+        elif self.verbose:
+            print(message)
+
+    def _in_batch(self) -> bool:
+        """Проверяет, выполняет ли текущий поток пакетную операцию"""
+        return self._pending is not None and self._batch_thread == threading.get_ident()
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Выполняет изменения внутри блока с одним сохранением в конце.
+        При ошибке все изменения блока отменяются в памяти и не сохраняются"""
+        if self._in_batch():  # Вложенный блок входит во внешнюю пакетную операцию
+            yield
+            return
+        self._materialize()
+        # Пакет может добавлять задачи, поэтому в режиме совместного доступа записывается под блокировкой
+        with self._mutation(allocates=True) as sync:
+            with self._rwlock.write():
+                self._pending, self._undo = [], []
+                self._batch_thread = threading.get_ident()
+                self._summary.clear()
+                dirty = self._dirty
+                try:
+                    yield
+                except BaseException:
+                    undo, self._undo = self._undo, None
+                    for action in reversed(undo):
+                        action()
+                    self._dirty = dirty
+                    if self.verbose:
+                        print("Пакетная операция отменена, изменения не сохранены")
+                    raise
+                finally:
+                    records, self._pending, self._undo, self._batch_thread = self._pending, None, None, None
+                with self._lock:
+                    self._unsaved.extend(records)
+            if self.autoflush or sync:
+                self._flush(direct=sync)
+        summary = self._summary
+        message = (f"Пакетная операция завершена: добавлено задач - {summary['add']}, "
+                   f"изменено - {summary['edit']}, удалено - {summary['delete']}")
+        if summary["missing"]:
+            message += f", не найдено - {summary['missing']}"
+        if self.verbose:
+            print(message)
+
+    @mutation(allocates=True)
+    def add_task(self, title: str, description: str, category: str, due_date: str, priority: str) -> Task:
         """Добавляет новую задачу"""
         new_task = Task(title, description, category, due_date, priority)
-        self.tasks.append(new_task)
-        self.save_tasks()
-        print(f"Задача '{title}' добавлена с ID {new_task.id}")
+        self._insert(new_task)
+        self._persist({"op": "add", "task": new_task.to_dict()})
+        self._report(f"Задача '{title}' добавлена с ID {new_task.id}", "add")
+        return new_task
+
+    def add_tasks(self, tasks: Iterable[Dict]) -> List[Task]:
+        """Добавляет несколько задач с одним сохранением"""
+        with self.batch():
+            return [self.add_task(**fields) for fields in tasks]
+
+    @staticmethod
+    def _page(tasks: Iterator[Task], limit: Optional[int]) -> Tuple[Optional[Task], Iterator[Task], Optional[str]]:
+        """Отбирает задачи страницы: возвращает первую задачу, остальные задачи и курсор следующей страницы"""
+        next_cursor = None
+        if limit is not None:
+            if limit < 1:
+                raise ValueError(f"Некорректный размер страницы: {limit}")
+            page = list(islice(tasks, limit + 1))
+            if len(page) > limit:
+                page.pop()
+                # Курсор - ID последней показанной задачи, по нему следующая страница находится двоичным поиском
+                next_cursor = str(page[-1].id)
+            tasks = iter(page)
+        return next(tasks, None), tasks, next_cursor
+
+    @staticmethod
+    def _after(cursor: Optional[str]) -> Optional[int]:
+        """Возвращает ID, за которым начинается страница с курсором cursor"""
+        if cursor is None:
+            return None
+        if not cursor.isdigit():
+            raise ValueError(f"Некорректный курсор страницы: {cursor}")
+        return int(cursor)
 
-    def list_tasks(self, category: Optional[str] = None) -> None:
-        """Выводит список задач. Если указана категория, выводятся только задачи из этой категории"""
-        if not self.tasks:
+    @reading
+    def list_tasks(self, category: Optional[str] = None, limit: Optional[int] = None,
+                   cursor: Optional[str] = None) -> Optional[str]:
+        """Выводит список задач. Если указана категория, выводятся только задачи из этой категории.
+        При заданном limit выводится страница не более чем из limit задач, следующих за курсором cursor,
+        и возвращается курсор следующей страницы или None для последней страницы"""
+        if not self._tasks:
             print("Нет задач для отображения")
+            return None
+        # Фильтрация задач по категории
+        tasks = self._iter_query(category=category, after=self._after(cursor))
+        first, tasks, next_cursor = self._page(tasks, limit)
+        if not first:
+            print(f"Нет задач в категории '{category}'" if category else "Нет задач для отображения")
         else:
-            # Фильтрация задач по категории
-            filtered_tasks = self.tasks if not category else [task for task in self.tasks if
-                                                              task.category.lower() == category.lower()]
-            if not filtered_tasks:
-                print(f"Нет задач в категории '{category}'")
-            else:
-                if category:
-                    print(f"Список задач в категории '{category}':")
-                else:
-                    print("Список всех задач:")
+            header = f"Список задач в категории '{category}':" if category else "Список всех задач:"
+            write_lines(header, (task.present_task() for task in chain([first], tasks)))
+        return next_cursor
+
+    @reading
+    def next_tasks(self, count: int = 5) -> List[Task]:
+        """Получает первые count невыполненных задач по убыванию приоритета и возрастанию срока"""
+        return [self._tasks[task_id] for task_id in self._agenda.top(count)]
 
-                for task in filtered_tasks:
-                    print(task.present_task())
+    @reading
+    def show_next_tasks(self, count: int = 5) -> None:
+        """Выводит ближайшие невыполненные задачи"""
+        tasks = self.next_tasks(count)
+        if not tasks:
+            print("Нет невыполненных задач")
+        else:
+            write_lines("Ближайшие задачи:", (task.present_task() for task in tasks))
 
+    @reading(lazy=True)
     def get_task(self, task_id: int) -> Task:
         """Получает задачу по ID"""
-        return next((task for task in self.tasks if task.id == task_id), None)
+        if not self._loaded:
+            return self.storage.get_task(task_id)
+        return self._tasks.get(task_id)
 
+    @reading(lazy=True)
     def get_tasks(self, keyword: Optional[str] = None, category: Optional[str] = None,
                   status: Optional[str] = None) -> List[Task]:
         """Получает задачи по ключевому слову, категории или статусу"""
+        return self.query(keyword=keyword, category=category, status=status)
+
+    @reading(lazy=True)
+    def query(self, keyword: Optional[str] = None,
+              category: Optional[str] = None,
+              status: Optional[str] = None,
+              priority: Optional[str] = None,
+              due_before: Optional[date] = None,
+              due_after: Optional[date] = None) -> List[Task]:
+        """Получает задачи, удовлетворяющие всем указанным критериям одновременно.
+        Границы срока due_after и due_before включаются в диапазон"""
+        return list(self._cached_query(keyword, category, status, priority, due_before, due_after))
+
+    def _cached_query(self, keyword: Optional[str], category: Optional[str], status: Optional[str],
+                      priority: Optional[str], due_before: Optional[date], due_after: Optional[date]) -> List[Task]:
+        """Возвращает результат запроса из кэша или выполняет запрос и кэширует его.
+        Возвращаемый список разделяется с кэшем и не должен изменяться"""
+        normalize = FieldIndex.normalize
+        key = (keyword.lower() if keyword else None, normalize(category) if category else None,
+               normalize(status) if status else None, normalize(priority) if priority else None,
+               due_before, due_after)
+        results = self._cache.get(key, self._generation)
+        if results is None:
+            if self._loaded:
+                results = list(self._iter_query(keyword, category, status, priority, due_before, due_after))
+            else:  # Ленивый режим: запрос выполняет хранилище
+                results = list(self.storage.query(keyword, category, status, priority, due_before, due_after))
+            self._cache.put(key, self._generation, results)
+            if self.stats is not None:
+                self.stats.record_results(len(results))
+        return results
+
+    def enable_stats(self, profile: bool = False) -> Stats:
+        """Включает сбор статистики операций и, при profile=True, профилирование"""
+        if self.stats is None:
+            Stats(profile=profile).attach(self)
+        return self.stats
+
+    def disable_stats(self) -> Optional[Stats]:
+        """Отключает сбор статистики и возвращает собранные данные"""
+        stats = self.stats
+        if stats is not None:
+            stats.detach()
+        return stats
+
+    def cache_info(self) -> CacheInfo:
+        """Возвращает статистику кэша результатов поиска"""
+        return self._cache.info()
+
+    def _iter_query(self, keyword: Optional[str] = None,
+                    category: Optional[str] = None,
+                    status: Optional[str] = None,
+                    priority: Optional[str] = None,
+                    due_before: Optional[date] = None,
+                    due_after: Optional[date] = None,
+                    after: Optional[int] = None) -> Iterator[Task]:
+        """Перебирает задачи, удовлетворяющие критериям query, в порядке возрастания ID начиная
+        за ID after. Вызывающий код должен удерживать блокировку чтения до окончания перебора"""
+        # Для каждого критерия: задачи для проверки вхождения и их упорядоченные ID, если они есть в индексе
+        postings = [(index.get(value), index.ordered(value)) for index, value in
+                    ((self._by_category, category), (self._by_status, status), (self._by_priority, priority))
+                    if value]
         if keyword:
-            return [task for task in self.tasks if
-                    keyword.lower() in task.title.lower() or keyword.lower() in task.description.lower()]
-        if category:
-            return [task for task in self.tasks if task.category.lower() == category.lower()]
-        if status:
-            return [task for task in self.tasks if task.status.lower() == status.lower()]
+            candidates = self._by_text.candidates(keyword)
+            if candidates is not None:
+                postings.append((candidates, None))
+            keyword = keyword.lower()
+
+        first = due_after.toordinal() if due_after else None
+        last = due_before.toordinal() if due_before else None
+        due_range = first is not None or last is not None
+
+        # Перебор начинается с самого избирательного критерия, остальные проверяются по вхождению.
+        # Число задач в диапазоне сроков считается двоичным поиском без обхода индекса
+        postings.sort(key=lambda posting: len(posting[0]))
+        if due_range and (not postings or self._by_due.count(first, last) < len(postings[0][0])):
+            others, ordered = postings, SortedIds(self._by_due.between(first, last))
+        elif postings:
+            (driver, ordered), others = postings[0], postings[1:]
+            ordered = ordered or SortedIds(driver)
+        else:
+            others, ordered = [], self._ids
+        others = [posting for posting, _ in others]
+
+        # Переход к курсору выполняется двоичным поиском, поэтому страница не требует перебора предыдущих
+        if self.stats is not None:
+            # Длина просмотра - число кандидатов ведущего критерия, считается без счетчика в цикле
+            self.stats.record_scan(len(ordered))
+        for task_id in ordered.after(after):
+            if not all(task_id in posting for posting in others):
+                continue
+            if keyword and not self._by_text.matches(task_id, keyword):
+                continue
+            task = self._tasks[task_id]
+            if due_range and not ((first is None or task.due_ordinal >= first) and
+                                  (last is None or task.due_ordinal <= last)):
+                continue
+            yield task
+
+    @reading
+    def due_between(self, start: Optional[date] = None, end: Optional[date] = None) -> List[Task]:
+        """Получает задачи со сроком выполнения в интервале [start, end], упорядоченные по сроку"""
+        task_ids = self._by_due.between(start.toordinal() if start else None, end.toordinal() if end else None)
+        return [self._tasks[task_id] for task_id in task_ids]
+
+    @reading
+    def overdue(self, today: Optional[date] = None) -> List[Task]:
+        """Получает невыполненные задачи, срок которых истек до указанного дня"""
+        today = today or date.today()
+        return [task for task in self.due_between(end=today - timedelta(days=1)) if task.status == "не выполнена"]
 
+    @reading
+    def due_within(self, days: int, today: Optional[date] = None) -> List[Task]:
+        """Получает невыполненные задачи со сроком в ближайшие days дней, включая сегодняшний"""
+        today = today or date.today()
+        return [task for task in self.due_between(today, today + timedelta(days=days))
+                if task.status == "не выполнена"]
+
+    @mutation
     def edit_task(self, task_id: int,
                   title: Optional[str] = None,
                   description: Optional[str] = None,
                   category: Optional[str] = None,
                   due_date: Optional[str] = None,
-                  priority: Optional[str] = None) -> None:
-        """Редактирует задачу по ID"""
+                  priority: Optional[str] = None) -> Optional[Task]:
+        """Редактирует задачу по ID и возвращает ее, если задача найдена"""
         task = self.get_task(task_id)
         if not task:
-            print(f"Задача с ID {task_id} не найдена")
+            self._report(f"Задача с ID {task_id} не найдена", "missing")
         else:
-            if title:
-                task.title = title
-            if description:
-                task.description = description
-            if category:
-                task.category = category
-            if due_date:
-                task.due_date = due_date
-            if priority:
-                task.priority = priority
-            self.save_tasks()
-            print(f"Задача с ID {task_id} успешно отредактирована")
-
-    def update_status(self, task_id: int) -> None:
-        """Обновляет статус задачи по ID на 'выполнена'"""
+            fields = {"title": title, "description": description, "category": category,
+                      "due_date": due_date, "priority": priority}
+            # Поля, совпадающие с текущими значениями, не изменяют задачу и не требуют записи
+            fields = {field: value for field, value in fields.items() if value and getattr(task, field) != value}
+            if not fields:
+                self._report(f"Данные задачи с ID {task_id} не изменились", "unchanged")
+                return task
+            self._update(task, fields)
+            self._persist({"op": "edit", "id": task_id, "fields": fields})
+            self._report(f"Задача с ID {task_id} успешно отредактирована", "edit")
+        return task
+
+    def edit_tasks(self, changes: Dict[int, Dict]) -> None:
+        """Редактирует несколько задач с одним сохранением, ключи словаря - ID задач"""
+        with self.batch():
+            for task_id, fields in changes.items():
+                self.edit_task(task_id, **fields)
+
+    @mutation
+    def update_status(self, task_id: int) -> Optional[Task]:
+        """Обновляет статус задачи по ID на 'выполнена' и возвращает ее, если задача найдена"""
         task = self.get_task(task_id)
         if not task:
-            print(f"Задача с ID {task_id} не найдена")
+            self._report(f"Задача с ID {task_id} не найдена", "missing")
         else:
             if task.status != "выполнена":
-                task.status = "выполнена"
-                self.save_tasks()
-                print(f"Задача с ID {task_id} отмечена как 'выполнена'")
+                self._update(task, {"status": "выполнена"})
+                self._persist({"op": "edit", "id": task_id, "fields": {"status": task.status}})
+                self._report(f"Задача с ID {task_id} отмечена как 'выполнена'", "edit")
             else:
-                print(f"Задача с ID {task_id} уже отмечена как 'выполнена'")
+                self._report(f"Задача с ID {task_id} уже отмечена как 'выполнена'", "unchanged")
+        return task
 
-    def delete_tasks(self, task_id: Optional[int] = None, category: Optional[str] = None) -> None:
-        """Удаляет задачи по ID или категории"""
+    @mutation
+    def delete_tasks(self, task_id: Optional[int] = None, category: Optional[str] = None) -> List[Task]:
+        """Удаляет задачи по ID или категории и возвращает удаленные задачи"""
+        deleted = []
         if task_id:  # Удаление задачи по ID
             task = self.get_task(task_id)
             if not task:
-                print(f"Задача с ID {task_id} не найдена")
+                self._report(f"Задача с ID {task_id} не найдена", "missing")
             else:
-                self.tasks.remove(task)
-                self.save_tasks()
-                print(f"Задача с ID {task_id} успешно удалена")
+                self._remove(task)
+                deleted.append(task)
+                self._persist({"op": "delete", "ids": [task_id]})
+                self._report(f"Задача с ID {task_id} успешно удалена", "delete")
 
         if category:  # Удаление задач по категории
             tasks = self.get_tasks(category=category)
             if tasks:
-                self.tasks = [task for task in self.tasks if task not in tasks]
-                self.save_tasks()
-                print(f"Задачи из категории '{category}' успешно удалены")
+                self._remove_many(tasks)
+                deleted.extend(tasks)
+                self._persist({"op": "delete", "ids": [task.id for task in tasks]})
+                self._report(f"Задачи из категории '{category}' успешно удалены", "delete", len(tasks))
             else:
-                print(f"Задачи из категории '{category}' не найдены")
+                self._report(f"Задачи из категории '{category}' не найдены", "missing")
+        return deleted
+
+    @reading(lazy=True)
+    def find_tasks(self, keyword: Optional[str] = None, category: Optional[str] = None,
+                   status: Optional[str] = None, priority: Optional[str] = None,
+                   due_before: Optional[date] = None, due_after: Optional[date] = None,
+                   overdue: bool = False, due_within: Optional[int] = None) -> List[Task]:
+        """Получает задачи по тем же критериям, что и search_tasks, без вывода на экран"""
+        return list(self._search(keyword, category, status, priority, due_before, due_after, overdue, due_within))
 
+    def _search(self, keyword: Optional[str], category: Optional[str], status: Optional[str],
+                priority: Optional[str], due_before: Optional[date], due_after: Optional[date],
+                overdue: bool, due_within: Optional[int]) -> List[Task]:
+        """Приводит критерии просроченных и ближайших задач к статусу и сроку и выполняет запрос.
+        Без критериев возвращает пустой список"""
+        today = date.today()
+        if overdue:
+            status, due_before = "не выполнена", today - timedelta(days=1)
+        if due_within is not None:
+            status, due_after, due_before = "не выполнена", today, today + timedelta(days=due_within)
+        if not (keyword or category or status or priority or due_before or due_after):
+            return []
+        return self._cached_query(keyword, category, status, priority, due_before, due_after)
+
+    @reading(lazy=True)
     def search_tasks(self, keyword: Optional[str] = None, category: Optional[str] = None,
-                     status: Optional[str] = None) -> None:
-        """Поиск задач по ключевому слову, категории или статусу"""
-        results = []
-        if keyword:
-            results = self.get_tasks(keyword=keyword)
-        if category:
-            results = self.get_tasks(category=category)
-        if status:
-            results = self.get_tasks(status=status)
-        if results:
-            print("Результаты поиска:")
-            print(*[task.present_task() for task in results], sep='\n')
+                     status: Optional[str] = None, priority: Optional[str] = None,
+                     due_before: Optional[date] = None, due_after: Optional[date] = None,
+                     overdue: bool = False, due_within: Optional[int] = None,
+                     limit: Optional[int] = None, cursor: Optional[str] = None) -> Optional[str]:
+        """Поиск задач по ключевому слову, категории, статусу, приоритету и сроку одновременно.
+        overdue отбирает просроченные невыполненные задачи, due_within - невыполненные задачи
+        со сроком в ближайшие due_within дней. Постраничный вывод задается limit и cursor, как в list_tasks"""
+        first, next_cursor = None, None
+        found = self._search(keyword, category, status, priority, due_before, due_after, overdue, due_within)
+        if found:
+            # Результаты упорядочены по ID, поэтому начало страницы находится двоичным поиском
+            start = 0 if cursor is None else bisect_right(found, self._after(cursor), key=lambda task: task.id)
+            first, results, next_cursor = self._page((found[i] for i in range(start, len(found))), limit)
+        if first:
+            write_lines("Результаты поиска:", (task.present_task() for task in chain([first], results)))
         else:
             print("Задачи по заданному запросу не найдены")
+        return next_cursor
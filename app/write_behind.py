@@ -0,0 +1,83 @@
+import queue
+import sys
+import threading
+import time
+from typing import Callable, Dict, List
+
+
+class _Flush:
+    """Запрос на немедленную запись накопленных изменений"""
+
+    def __init__(self, stop: bool = False):
+        self.stop = stop
+        self.done = threading.Event()
+
+
+class WriteBehind:
+    """Отложенная запись изменений в фоновом потоке.
+    Записи операций попадают в ограниченную очередь, поток объединяет идущие подряд изменения
+    и сохраняет их одной записью не позже чем через max_staleness секунд после первого из них"""
+
+    def __init__(self, write: Callable[[List[Dict]], None], max_staleness: float = 1.0, max_pending: int = 1000):
+        self.write = write
+        self.max_staleness = max_staleness
+        self.max_pending = max_pending
+        # Заполненная очередь блокирует добавление новых записей, пока поток не освободит место
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._failed: List[Dict] = []
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="tasks-write-behind", daemon=True)
+        self._thread.start()
+
+    def put(self, record: Dict) -> None:
+        """Ставит запись операции в очередь на сохранение"""
+        self._queue.put(record)
+
+    def flush(self) -> None:
+        """Дожидается сохранения всех поставленных в очередь изменений"""
+        if not self._closed:
+            self._request(_Flush())
+
+    def close(self) -> None:
+        """Сохраняет оставшиеся изменения и останавливает фоновый поток"""
+        if not self._closed:
+            self._request(_Flush(stop=True))
+            self._thread.join()
+            self._closed = True
+
+    def _request(self, request: _Flush) -> None:
+        self._queue.put(request)
+        request.done.wait()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            records = []
+            deadline = time.monotonic() + self.max_staleness
+            # Изменения, пришедшие до истечения окна, объединяются в одну запись
+            while not isinstance(item, _Flush):
+                records.append(item)
+                timeout = deadline - time.monotonic()
+                if len(records) >= self.max_pending or timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+            self._write(records)
+            if isinstance(item, _Flush):
+                item.done.set()
+                if item.stop:
+                    return
+
+    def _write(self, records: List[Dict]) -> None:
+        records = self._failed + records
+        if not records:
+            return
+        try:
+            self.write(records)
+            self._failed = []
+        except Exception as error:
+            # Изменения не теряются и будут повторно записаны вместе со следующими
+            self._failed = records
+            print(f"Ошибка фонового сохранения задач: {error}", file=sys.stderr)
@@ -0,0 +1,54 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+from typing import Dict, List
+from app.mapped_store import MappedTaskStore
+from app.storage import BinaryStorage, JsonLinesStorage, JsonStorage, Storage
+from app.task import Task
+from benchmarks.generate import generate_tasks
+from benchmarks.run import timed
+
+FORMATS = {
+    "json": lambda filename: JsonStorage(filename),
+    "json_compact": lambda filename: JsonStorage(filename, indent=None),
+    "jsonl": lambda filename: JsonLinesStorage(filename),
+    "binary": lambda filename: BinaryStorage(filename),
+    "binary_gzip": lambda filename: BinaryStorage(filename, "gzip"),
+    "binary_lzma": lambda filename: BinaryStorage(filename, "lzma"),
+    "mapped": lambda filename: MappedTaskStore(filename),
+}
+
+
+def compare_formats(size: int, directory: str, seed: int = 42) -> Dict:
+    """Измеряет время загрузки и сохранения и размер файла для каждого формата хранения"""
+    tasks = list(map(Task.from_dict, generate_tasks(size, seed)))
+    results = {}
+    for name, create in FORMATS.items():
+        storage: Storage = create(os.path.join(directory, f"tasks_{size}_{name}"))
+        save = timed(lambda: storage.save(tasks))
+        load = timed(lambda: list(storage.load()))
+        results[name] = {"load_ms": load["seconds"] * 1e3, "save_ms": save["seconds"] * 1e3,
+                         "file_bytes": os.path.getsize(storage.filename)}
+        storage.close()
+        os.remove(storage.filename)
+    return results
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Сравнение форматов хранения задач по времени загрузки и размеру")
+    parser.add_argument("--sizes", type=int, nargs="+", default=(10000, 100000), help="размеры наборов задач")
+    parser.add_argument("--seed", type=int, default=42, help="начальное значение генератора данных")
+    args = parser.parse_args(argv)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for size in args.sizes:
+            results[str(size)] = compare_formats(size, directory, args.seed)
+    print(json.dumps(results, ensure_ascii=False, indent=4))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,44 @@
+import random
+from datetime import date, timedelta
+from typing import Dict, Iterator
+from app.storage import open_storage
+from app.task import PRIORITY_LABELS, STATUS_LABELS, Task
+
+CATEGORIES = ("Работа", "Личное", "Обучение", "Дом", "Здоровье", "Финансы", "Покупки", "Путешествия",
+              "Семья", "Спорт", "Хобби", "Документы")
+VERBS = ("Подготовить", "Проверить", "Написать", "Купить", "Позвонить", "Отправить", "Изучить", "Оплатить",
+         "Записаться на", "Обсудить", "Разобрать", "Обновить", "Забронировать", "Починить", "Согласовать")
+OBJECTS = ("отчет", "презентацию", "договор", "продукты", "клиенту", "письмо руководителю", "курс Python",
+           "коммунальные услуги", "прием к врачу", "план проекта", "почту", "резюме", "билеты", "кран",
+           "бюджет на месяц", "документы для визы", "тренировку", "подарок", "смету", "заявку")
+DETAILS = ("до конца недели", "с учетом замечаний", "по итогам встречи", "в приоритетном порядке",
+           "вместе с командой", "после обеда", "без спешки", "по новому шаблону", "для отдела продаж",
+           "по списку из заметок", "и сохранить копию", "и сообщить о результате")
+START_DATE = date(2024, 1, 1)
+DATE_RANGE = 3 * 365
+
+
+def generate_tasks(count: int, seed: int = 42) -> Iterator[Dict]:
+    """Генерирует воспроизводимый набор задач в формате словарей хранилища"""
+    rng = random.Random(seed)
+    for task_id in range(1, count + 1):
+        verb, target = rng.choice(VERBS), rng.choice(OBJECTS)
+        yield {
+            "id": task_id,
+            "title": f"{verb} {target}",
+            "description": f"{verb} {target} {rng.choice(DETAILS)}",
+            "category": rng.choice(CATEGORIES),
+            "due_date": f"{START_DATE + timedelta(days=rng.randrange(DATE_RANGE)):%d.%m.%Y}",
+            # Высокий приоритет и выполненные задачи встречаются реже остальных
+            "priority": rng.choices(PRIORITY_LABELS, weights=(3, 5, 2))[0],
+            "status": rng.choices(STATUS_LABELS, weights=(7, 3))[0],
+        }
+
+
+def write_dataset(filename: str, count: int, seed: int = 42) -> None:
+    """Записывает набор из count задач в файл в формате, определяемом расширением"""
+    storage = open_storage(filename)
+    try:
+        storage.save(map(Task.from_dict, generate_tasks(count, seed)))
+    finally:
+        storage.close()
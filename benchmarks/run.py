@@ -0,0 +1,144 @@
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from itertools import count, cycle
+from typing import Callable, Dict, List
+from app.task_manager import TaskManager
+from benchmarks.generate import CATEGORIES, OBJECTS, write_dataset
+
+SIZES = (1000, 10000, 100000, 1000000)
+# Допустимое замедление относительно базовых результатов, после которого операция считается регрессией
+TOLERANCE = 0.25
+
+
+def timed(operation: Callable[[], object], repeat: int = 1, rounds: int = 3) -> Dict:
+    """Выполняет операцию rounds серий по repeat раз и возвращает время лучшей серии,
+    наименее искаженное посторонней нагрузкой на машину"""
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            operation()
+        best = min(best, time.perf_counter() - start)
+    return {"seconds": best, "repeat": repeat, "per_op_us": best / repeat * 1e6}
+
+
+def open_manager(filename: str) -> TaskManager:
+    # Журнал вместо полной перезаписи файла на каждое изменение и отключенный кэш,
+    # чтобы повторные запросы измеряли поиск, а не попадания в кэш
+    return TaskManager(filename, journal=True, verbose=False, query_cache=0)
+
+
+def run_size(size: int, directory: str, seed: int = 42, operations: int = 200, extension: str = ".json") -> Dict:
+    """Измеряет операции TaskManager на наборе из size задач"""
+    filename = os.path.join(directory, f"tasks_{size}{extension}")
+    write_dataset(filename, size, seed)
+    results = {}
+
+    tracemalloc.start()
+    manager = open_manager(filename)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    manager.close()
+    del manager
+    results["memory"] = {"resident_bytes": current, "peak_bytes": peak, "bytes_per_task": current / size}
+
+    loaded = {}
+    results["load"] = timed(lambda: loaded.update(manager=open_manager(filename)))
+    manager = loaded.pop("manager")
+    rng = random.Random(seed)
+    task_ids = [task.id for task in manager.tasks]
+    results["load_tasks"] = timed(manager.load_tasks)
+
+    sample = [rng.choice(task_ids) for _ in range(operations)]
+    lookups = cycle(sample)
+    results["get_task"] = timed(lambda: manager.get_task(next(lookups)), operations)
+    results["get_tasks_category"] = timed(lambda: manager.get_tasks(category=rng.choice(CATEGORIES)), 20)
+    results["search_keyword"] = timed(lambda: manager.query(keyword=rng.choice(OBJECTS)), 20)
+    results["search_category"] = timed(lambda: manager.query(category=rng.choice(CATEGORIES)), 20)
+    results["search_status"] = timed(lambda: manager.query(status="выполнена"), 20)
+    results["search_combined"] = timed(lambda: manager.query(keyword="отчет", category="Работа",
+                                                             status="не выполнена", priority="высокий"), 20)
+
+    numbers = count()
+    results["add"] = timed(lambda: manager.add_task(f"Новая задача {next(numbers)}", "Описание новой задачи",
+                                                    rng.choice(CATEGORIES), "30.01.2025", "средний"), operations)
+    edits = cycle(sample)
+    results["edit"] = timed(lambda: manager.edit_task(next(edits), title=f"Измененная задача {rng.random()}"),
+                            operations)
+    updates = cycle(sample)
+    # Повторная серия застала бы задачи уже выполненными, поэтому замеряется одна серия
+    results["update_status"] = timed(lambda: manager.update_status(next(updates)), operations, rounds=1)
+    results["save"] = timed(manager.compact)
+    # Удаление категории необратимо, поэтому каждая серия удаляет следующую категорию
+    categories = iter(CATEGORIES)
+    results["delete_category"] = timed(lambda: manager.delete_tasks(category=next(categories)))
+    manager.close()
+    for path in (filename, f"{filename}.log"):
+        if os.path.exists(path):
+            os.remove(path)
+    return results
+
+
+def compare(results: Dict, baseline: Dict, tolerance: float = TOLERANCE) -> List[str]:
+    """Возвращает описания операций, замедлившихся относительно базовых результатов больше допустимого"""
+    regressions = []
+    for size, operations in results["results"].items():
+        for name, measurement in operations.items():
+            base = baseline.get("results", {}).get(size, {}).get(name)
+            if not base or "per_op_us" not in measurement:
+                continue
+            ratio = measurement["per_op_us"] / base["per_op_us"]
+            if ratio > 1 + tolerance:
+                regressions.append(f"{size} задач, {name}: {base['per_op_us']:.1f} -> "
+                                   f"{measurement['per_op_us']:.1f} мкс (x{ratio:.2f})")
+    return regressions
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Замеры производительности TaskManager на синтетических данных")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES, help="размеры наборов задач")
+    parser.add_argument("--seed", type=int, default=42, help="начальное значение генератора данных")
+    parser.add_argument("--operations", type=int, default=200, help="число изменений каждого вида")
+    parser.add_argument("--format", choices=(".json", ".jsonl", ".db", ".bin"), default=".json",
+                        help="формат хранилища")
+    parser.add_argument("--output", help="файл для записи результатов в формате JSON")
+    parser.add_argument("--baseline", help="файл базовых результатов для сравнения")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE, help="допустимое относительное замедление")
+    args = parser.parse_args(argv)
+
+    results = {
+        "meta": {"python": platform.python_version(), "platform": platform.platform(), "seed": args.seed,
+                 "format": args.format, "created": datetime.now().isoformat(timespec="seconds")},
+        "results": {},
+    }
+    with tempfile.TemporaryDirectory() as directory:
+        for size in args.sizes:
+            print(f"Замер на {size} задачах...", file=sys.stderr)
+            results["results"][str(size)] = run_size(size, directory, args.seed, args.operations, args.format)
+
+    output = json.dumps(results, ensure_ascii=False, indent=4)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(output)
+    else:
+        print(output)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as file:
+            regressions = compare(results, json.load(file), args.tolerance)
+        for regression in regressions:
+            print(f"Регрессия: {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,33 @@
-from app.service import add_task, edit_task, update_status, delete_task, search_tasks, list_tasks
+import os
+import signal
+import sys
+from app import cli
+from app.service import add_task, edit_task, update_status, delete_task, search_tasks, list_tasks, show_diagnostics
 from app.task_manager import TaskManager
 
 FILENAME = "tasks.json"
+# Отложенная запись включается переменной окружения TASKS_WRITE_BEHIND=1: изменения записываются
+# в фоновом потоке не позже чем через MAX_STALENESS секунд и могут быть потеряны при аварийном завершении
+WRITE_BEHIND = os.environ.get("TASKS_WRITE_BEHIND") == "1"
+MAX_STALENESS = 1.0
+# Совместный доступ включается переменной окружения TASKS_SHARED=1: несколько запущенных копий программы
+# могут работать с одним файлом задач
+SHARED = os.environ.get("TASKS_SHARED") == "1"
+# Списки задач и результаты поиска выводятся страницами по PAGE_SIZE задач
+PAGE_SIZE = 20
 
 
 def main():
-    tasks_manager = TaskManager(FILENAME)
+    tasks_manager = TaskManager(FILENAME, write_behind=WRITE_BEHIND, max_staleness=MAX_STALENESS, shared=SHARED)
+    # SIGTERM завершает программу штатно, чтобы отложенные изменения были записаны
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        run_menu(tasks_manager)
+    finally:
+        tasks_manager.close()
+
+
+def run_menu(tasks_manager: TaskManager):
     while True:
         print("\nМеню:")
         print("1. Просмотр задач")
@@ -21,14 +43,15 @@ def main():
                 print("\nПодменю:")
                 print("1. Просмотр всех задач")
                 print("2. Просмотр задач по категориям")
-                print("3. Возврат в основное меню")
+                print("3. Ближайшие задачи")
+                print("4. Возврат в основное меню")
                 sub_choice = input("Выберите поддействие: ")
                 print('')
 
-                if sub_choice in ["1", "2"]:  # Просмотр всех текущих задач или задач по категориям
-                    list_tasks(tasks_manager, sub_choice)
+                if sub_choice in ["1", "2", "3"]:  # Просмотр всех задач, задач по категориям или ближайших задач
+                    list_tasks(tasks_manager, sub_choice, page_size=PAGE_SIZE)
                     break
-                elif sub_choice == "3":  # Возврат в основное меню
+                elif sub_choice == "4":  # Возврат в основное меню
                     print("Возврат в основное меню...")
                     break
                 else:
@@ -86,19 +109,27 @@ def main():
                 print("1. Поиск по ключевым словам")
                 print("2. Поиск по категории")
                 print("3. Поиск по статусу выполнения")
-                print("4. Возврат в основное меню")
+                print("4. Поиск по нескольким критериям")
+                print("5. Поиск по интервалу срока выполнения")
+                print("6. Просроченные задачи")
+                print("7. Задачи со сроком в ближайшие дни")
+                print("8. Возврат в основное меню")
                 sub_choice = input("Выберите поддействие: ")
                 print('')
 
-                if sub_choice in ["1", "2", "3"]:  # Поиск по ключевым словам, категории или статусу
-                    search_tasks(tasks_manager, option=sub_choice)
+                if sub_choice in ["1", "2", "3", "4", "5", "6", "7"]:  # Поиск по полям, их сочетанию или сроку
+                    search_tasks(tasks_manager, option=sub_choice, page_size=PAGE_SIZE)
                     break
-                elif sub_choice == "4":  # Возврат в основное меню
+                elif sub_choice == "8":  # Возврат в основное меню
                     print("Возврат в основное меню...")
                     break
                 else:
                     print("Неверный выбор поддействия!")
 
+        elif choice == "диагностика":  # Скрытый пункт: статистика операций
+            print('')
+            show_diagnostics(tasks_manager)
+
         elif choice == "6":  # Выход
             print("\nЗавершение работы")
             break
@@ -108,4 +139,8 @@ def main():
 
 
 if __name__ == "__main__":
+    # С аргументами командной строки выполняется команда без интерактивного меню, например:
+    # python main.py add "Купить молоко" -d "2 литра" -c Дом --due 01.02.2025 -p высокий
+    if len(sys.argv) > 1:
+        sys.exit(cli.main(sys.argv[1:], filename=FILENAME))
     main()
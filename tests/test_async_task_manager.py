@@ -0,0 +1,69 @@
+import asyncio
+from datetime import date
+import pytest
+from app.async_task_manager import AsyncTaskManager
+from app.task_manager import TaskManager
+
+
+def test_async_operations(tmp_path, capsys):
+    """Тест асинхронных операций, возвращающих данные без вывода на экран"""
+    test_file = f"{tmp_path}/test_tasks.json"
+
+    async def scenario():
+        manager = await AsyncTaskManager.open(test_file)
+        task = await manager.add("Изучить asyncio", "Разобрать цикл событий", "Обучение", "30.01.2025", "высокий")
+        assert await manager.get(task.id) is task
+        edited = await manager.edit(task.id, title="Изучить asyncio подробно")
+        assert edited.title == "Изучить asyncio подробно"
+        assert await manager.edit(999, title="Нет такой задачи") is None
+        completed = await manager.complete(task.id)
+        assert completed.status == "выполнена"
+        assert await manager.query(keyword="asyncio", status="выполнена") == [task]
+        assert await manager.query(due_after=date(2025, 1, 30), due_before=date(2025, 1, 30)) == [task]
+        assert await manager.query(due_after=date(2025, 1, 31)) == []
+        assert await manager.delete(task_id=task.id) == [task]
+        assert await manager.get(task.id) is None
+        await manager.close()
+
+    asyncio.run(scenario())
+    assert capsys.readouterr().out == ""
+    assert TaskManager(test_file).tasks == []
+
+
+def test_async_shared_save(tmp_path, monkeypatch):
+    """Тест объединения одновременных сохранений в одну запись"""
+    test_file = f"{tmp_path}/test_tasks.json"
+    writes = []
+
+    async def scenario():
+        manager = await AsyncTaskManager.open(test_file)
+        original_write = manager.manager.storage.write
+
+        def write(records, tasks):
+            writes.append(len(records))
+            original_write(records, tasks)
+
+        monkeypatch.setattr(manager.manager.storage, "write", write)
+        tasks = await asyncio.gather(*(
+            manager.add(f"Задача {number}", "Описание задачи", "Работа", "30.01.2025", "средний")
+            for number in range(10)
+        ))
+        await manager.close()
+        return tasks
+
+    tasks = asyncio.run(scenario())
+    assert writes == [10]
+    reloaded = TaskManager(test_file)
+    assert [task.id for task in reloaded.tasks] == [task.id for task in tasks]
+
+
+@pytest.mark.parametrize("option", AsyncTaskManager.UNSUPPORTED)
+def test_async_unsupported_options(tmp_path, option):
+    """Тест отказа от режимов, в которых операции блокировали бы цикл событий"""
+    test_file = f"{tmp_path}/test_tasks.json"
+    with pytest.raises(ValueError):
+        asyncio.run(AsyncTaskManager.open(test_file, **{option: True}))
+    task_manager = TaskManager(f"{tmp_path}/test_tasks.db", **{option: True})
+    with pytest.raises(ValueError):
+        AsyncTaskManager(task_manager)
+    task_manager.close()
@@ -0,0 +1,28 @@
+from benchmarks.generate import generate_tasks, write_dataset
+from benchmarks.run import compare, run_size
+from app.task_manager import TaskManager
+
+
+def test_generate_tasks(tmp_path):
+    """Тест воспроизводимости синтетического набора задач"""
+    tasks = list(generate_tasks(100, seed=7))
+    assert tasks == list(generate_tasks(100, seed=7))
+    assert tasks != list(generate_tasks(100, seed=8))
+    assert [task["id"] for task in tasks] == list(range(1, 101))
+
+    test_file = f"{tmp_path}/test_tasks.json"
+    write_dataset(test_file, 100, seed=7)
+    assert [task.to_dict() for task in TaskManager(test_file).tasks] == tasks
+
+
+def test_run_and_compare(tmp_path):
+    """Тест замеров на небольшом наборе и сравнения с базовыми результатами"""
+    results = {"results": {"50": run_size(50, str(tmp_path), operations=5)}}
+    assert {"load", "save", "add", "edit", "update_status", "search_keyword", "delete_category"} <= set(
+        results["results"]["50"])
+    assert results["results"]["50"]["memory"]["peak_bytes"] > 0
+
+    baseline = {"results": {"50": {"add": {"per_op_us": results["results"]["50"]["add"]["per_op_us"] / 2}}}}
+    regressions = compare(results, baseline, tolerance=0.25)
+    assert len(regressions) == 1 and "add" in regressions[0]
+    assert compare(results, results) == []
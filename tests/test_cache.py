@@ -0,0 +1,31 @@
+from app.cache import QueryCache
+
+
+def test_query_cache_generation():
+    """Тест отбрасывания результатов прошлого поколения данных"""
+    cache = QueryCache()
+    cache.put("работа", 1, [1, 2])
+    assert cache.get("работа", 1) == [1, 2]
+    assert cache.get("работа", 2) is None
+    assert cache.get("работа", 1) is None
+    assert cache.info() == (1, 2, 128, 0)
+
+
+def test_query_cache_eviction():
+    """Тест вытеснения давно не использованных результатов"""
+    cache = QueryCache(maxsize=2, max_items=5)
+    cache.put("первый", 1, [1])
+    cache.put("второй", 1, [2])
+    cache.get("первый", 1)
+    cache.put("третий", 1, [3])
+    assert cache.get("второй", 1) is None
+    assert cache.get("первый", 1) == [1]
+
+    cache = QueryCache(maxsize=3, max_items=5)
+    cache.put("первый", 1, [1])
+    cache.put("большой", 1, [2, 3, 4, 5])
+    cache.put("второй", 1, [6])
+    assert cache.get("первый", 1) is None
+    assert cache.get("большой", 1) == [2, 3, 4, 5]
+    cache.put("огромный", 1, list(range(6)))
+    assert cache.get("огромный", 1) is None
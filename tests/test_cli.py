@@ -0,0 +1,91 @@
+import io
+import json
+from app import cli
+from app.storage import JsonStorage
+from app.task import Task
+from app.task_manager import TaskManager
+
+
+def run(capsys, test_file, *argv):
+    code = cli.main(["--file", test_file, "--json", *argv])
+    return code, json.loads(capsys.readouterr().out)
+
+
+def test_cli_commands(tmp_path, capsys):
+    """Тест отдельных команд с выводом в формате JSON и кодами завершения"""
+    test_file = f"{tmp_path}/test_tasks.json"
+    code, result = run(capsys, test_file, "add", "Изучить Python", "-d", "Пройти основы языка", "-c", "Обучение",
+                       "--due", "30.01.2025", "-p", "Высокий")
+    assert code == cli.EXIT_OK and result["ok"]
+    task_id = result["task"]["id"]
+    assert result["task"]["priority"] == "высокий"
+
+    code, result = run(capsys, test_file, "edit", str(task_id), "-t", "Изучить Python подробно")
+    assert code == cli.EXIT_OK and result["task"]["title"] == "Изучить Python подробно"
+    code, result = run(capsys, test_file, "done", str(task_id), str(task_id + 1))
+    assert code == cli.EXIT_NOT_FOUND and not result["ok"]
+    assert result["missing"] == [task_id + 1] and result["tasks"][0]["status"] == "выполнена"
+
+    code, result = run(capsys, test_file, "search", "-k", "PYTHON", "-s", "выполнена")
+    assert code == cli.EXIT_OK and [task["id"] for task in result["tasks"]] == [task_id]
+    code, result = run(capsys, test_file, "list", "-c", "Работа")
+    assert code == cli.EXIT_NOT_FOUND and result["tasks"] == []
+
+    code, result = run(capsys, test_file, "add", "Задача", "-d", "Описание", "-c", "Работа", "--due", "31.02.2025",
+                       "-p", "низкий")
+    assert code == cli.EXIT_ERROR and "срок" in result["error"]
+    assert cli.main(["--file", test_file, "delete"]) == cli.EXIT_ERROR
+    assert cli.main(["--file", test_file, "add", "Задача"]) == cli.EXIT_ERROR
+    assert cli.main(["--file", test_file, "list", "--limit", "0"]) == cli.EXIT_ERROR
+    assert "usage" in capsys.readouterr().err
+
+    code, result = run(capsys, test_file, "delete", "-c", "обучение")
+    assert code == cli.EXIT_OK and result["deleted"] == [task_id]
+    assert TaskManager(test_file).tasks == []
+
+
+def test_cli_batch(tmp_path, capsys, monkeypatch):
+    """Тест пакетного выполнения команд со стандартного ввода с одним сохранением"""
+    test_file = f"{tmp_path}/test_tasks.json"
+    # Задачи нового файла получают ID с 1, на которые ссылаются команды пакета
+    monkeypatch.setattr(Task, "_counter", 0)
+    saves = []
+    original_save = JsonStorage.save
+    monkeypatch.setattr(JsonStorage, "save", lambda self, tasks: saves.append(1) or original_save(self, tasks))
+    commands = "\n".join(
+        [f'add "Задача {number}" -d "Описание задачи" -c Работа --due 30.01.2025 -p средний' for number in range(50)]
+        + ["# Комментарий", "", "done 1 2", "edit 3 -c Личное", "delete 4 -c работа", "done 999"]
+    )
+    monkeypatch.setattr("sys.stdin", io.StringIO(commands))
+    code, result = run(capsys, test_file, "batch")
+    assert code == cli.EXIT_NOT_FOUND
+    assert len(result["results"]) == 54 and result["results"][-1] == {
+        "line": 56, "command": "done", "ok": False, "tasks": [], "missing": [999]}
+    assert saves == [1]
+    tasks = TaskManager(test_file).tasks
+    assert [(task.id, task.category) for task in tasks] == [(3, "Личное")]
+
+
+def test_cli_batch_errors(tmp_path, capsys):
+    """Тест отмены всего пакета при ошибке в любой строке"""
+    test_file = f"{tmp_path}/test_tasks.json"
+    commands = tmp_path / "commands.txt"
+    commands.write_text('add "Задача" -d "Описание" -c Работа --due 30.01.2025 -p средний\n'
+                        'add "Задача" -d "Описание" -c Работа --due 30.01.2025 -p срочный\n', encoding="utf-8")
+    code, result = run(capsys, test_file, "batch", str(commands))
+    assert code == cli.EXIT_ERROR and result["error"].startswith("строка 2")
+
+    commands.write_text('add "Задача" -d "Описание" -c Работа --due 30.01.2025 -p средний\n'
+                        'add "Задача" -d "Описание" -c Работа --due 30.13.2025 -p средний\n', encoding="utf-8")
+    code, result = run(capsys, test_file, "batch", str(commands))
+    assert code == cli.EXIT_ERROR and "срок" in result["error"]
+
+    commands.write_text("list\n", encoding="utf-8")
+    assert run(capsys, test_file, "batch", str(commands))[0] == cli.EXIT_ERROR
+
+    # Справка в строке пакета - ошибка строки, а не вывод справки с завершением процесса
+    commands.write_text('add "Задача" -d "Описание" -c Работа --due 30.01.2025 -p средний\n'
+                        'add --help\n', encoding="utf-8")
+    code, result = run(capsys, test_file, "batch", str(commands))
+    assert code == cli.EXIT_ERROR and result["error"].startswith("строка 2")
+    assert TaskManager(test_file).tasks == []
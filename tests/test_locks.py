@@ -0,0 +1,44 @@
+import threading
+from app.locks import RWLock
+
+
+def test_readers_share_lock():
+    """Тест одновременного захвата блокировки несколькими читателями"""
+    lock = RWLock()
+    barrier = threading.Barrier(3, timeout=5)
+
+    def read():
+        with lock.read():
+            barrier.wait()
+
+    threads = [threading.Thread(target=read) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    # Все читатели оказываются внутри блокировки одновременно
+    barrier.wait()
+    for thread in threads:
+        thread.join()
+
+
+def test_writer_is_exclusive():
+    """Тест исключительного доступа писателя и повторного захвата тем же потоком"""
+    lock = RWLock()
+    events = []
+    reader_started = threading.Event()
+
+    def read():
+        reader_started.set()
+        with lock.read():
+            events.append("read")
+
+    with lock.write():
+        with lock.write(), lock.read():
+            events.append("nested")
+        thread = threading.Thread(target=read)
+        thread.start()
+        reader_started.wait(5)
+        thread.join(0.1)
+        assert thread.is_alive()
+        events.append("write")
+    thread.join(5)
+    assert events == ["nested", "write", "read"]
@@ -0,0 +1,114 @@
+from datetime import date
+import pytest
+from app.mapped_store import MappedTaskStore, write_mapped
+from app.task import Task
+from app.task_manager import TaskManager
+
+
+@pytest.fixture
+def tasks():
+    """Создает набор задач в разных категориях"""
+    tasks = [
+        Task("Изучить Python", "Пройти основы языка", "Обучение", "30.01.2025", "высокий"),
+        Task("Пройти курс Django", "Изучить основы Django", "Работа", "20.12.2024", "средний"),
+        Task("Изучить Flask", "Основы Flask", "Обучение", "01.01.2025", "низкий"),
+    ]
+    tasks[1].status = "выполнена"
+    return tasks
+
+
+@pytest.fixture
+def store(tmp_path, tasks):
+    """Создает отображаемый в память файл задач"""
+    write_mapped(f"{tmp_path}/test_tasks.tsm", reversed(tasks))
+    store = MappedTaskStore(f"{tmp_path}/test_tasks.tsm", cache_size=2)
+    yield store
+    store.close()
+
+
+def test_mapped_get_task(store, tasks):
+    """Тест декодирования отдельных задач по ID с ограниченным кэшем"""
+    assert len(store) == 3
+    assert list(store.ids()) == [task.id for task in tasks]
+    assert store.get_task(tasks[1].id).to_dict() == tasks[1].to_dict()
+    assert store.get_task(tasks[1].id) is store.get_task(tasks[1].id)
+    assert store.get_task(max(task.id for task in tasks) + 1) is None
+
+    store.get_task(tasks[0].id)
+    store.get_task(tasks[2].id)
+    info = store.cache_info()
+    assert (info.hits, info.misses, info.currsize) == (2, 3, 2)
+
+
+def test_mapped_query(store, tasks):
+    """Тест поиска по кодам полей и тексту в отображенном файле"""
+    first_id, second_id, third_id = [task.id for task in tasks]
+    assert [task.id for task in store.query(keyword="ОСНОВЫ")] == [first_id, second_id, third_id]
+    assert [task.id for task in store.query(keyword="основы", category="обучение")] == [first_id, third_id]
+    assert [task.id for task in store.query(status="выполнена")] == [second_id]
+    assert [task.id for task in store.query(priority="Низкий")] == [third_id]
+    assert [task.id for task in store.query(due_before=date(2025, 1, 1))] == [second_id, third_id]
+    assert [task.id for task in store.query(due_after=date(2025, 1, 1))] == [first_id, third_id]
+    assert list(store.query(category="Личное")) == []
+
+
+def test_mapped_storage(tmp_path, store, tasks):
+    """Тест работы TaskManager с отображаемым файлом в качестве хранилища"""
+    task_manager = TaskManager(store.filename, storage=store)
+    assert [task.to_dict() for task in task_manager.tasks] == [task.to_dict() for task in tasks]
+    task_manager.update_status(tasks[0].id)
+    task_manager.delete_tasks(task_id=tasks[2].id)
+
+    reopened = MappedTaskStore(store.filename)
+    assert [task.to_dict() for task in reopened.load()] == [task.to_dict() for task in task_manager.tasks]
+    assert reopened.get_task(tasks[0].id).status == "выполнена"
+    reopened.close()
+
+    empty = MappedTaskStore(f"{tmp_path}/missing.tsm")
+    assert len(empty) == 0
+    assert TaskManager(f"{tmp_path}/other.json", storage=empty).storage is empty
+    (tmp_path / "broken.tsm").write_bytes(b"TSKM")
+    with pytest.raises(ValueError):
+        MappedTaskStore(f"{tmp_path}/broken.tsm")
+
+
+def test_mapped_lazy_manager(store, tasks):
+    """Тест ленивого режима: get_task и query выполняет отображенный файл без загрузки всех задач"""
+    first_id, second_id, third_id = [task.id for task in tasks]
+    store.close()
+    task_manager = TaskManager(store.filename, lazy=True, verbose=False)
+    assert isinstance(task_manager.storage, MappedTaskStore)
+    assert task_manager.get_task(second_id).to_dict() == tasks[1].to_dict()
+    assert [task.id for task in task_manager.query(keyword="основы", category="обучение")] == [first_id, third_id]
+    assert [task.id for task in task_manager.find_tasks(due_after=date(2025, 1, 1))] == [first_id, third_id]
+    assert task_manager.storage.cache_info().misses == 3
+    assert not hasattr(task_manager, "_tasks")
+
+    # Изменение загружает все задачи, после чего поиск выполняется по индексам в памяти
+    task_manager.update_status(first_id)
+    assert hasattr(task_manager, "_tasks")
+    assert [task.id for task in task_manager.query(status="выполнена")] == [first_id, second_id]
+    task_manager.close()
+
+    task_manager = TaskManager(store.filename, lazy=True)
+    assert task_manager.get_task(first_id).status == "выполнена"
+    assert task_manager.get_task(third_id + 1) is None
+    assert len(task_manager.tasks) == 3
+    task_manager.close()
+
+
+def test_mapped_shared_managers(tmp_path):
+    """Тест совместной работы двух TaskManager с одним отображаемым файлом"""
+    filename = f"{tmp_path}/test_tasks.tsm"
+    first = TaskManager(filename, shared=True, verbose=False)
+    second = TaskManager(filename, shared=True, verbose=False)
+    first_task = first.add_task("Изучить Python", "Пройти основы языка", "Обучение", "30.01.2025", "высокий")
+    second_task = second.add_task("Изучить Flask", "Основы Flask", "Обучение", "01.01.2025", "низкий")
+    first.edit_task(second_task.id, priority="средний")
+    second.update_status(first_task.id)
+    first.refresh()
+    assert [task.to_dict() for task in first.tasks] == [task.to_dict() for task in second.tasks]
+    assert [(task.priority, task.status) for task in first.tasks] == [("высокий", "выполнена"),
+                                                                      ("средний", "не выполнена")]
+    first.close()
+    second.close()
@@ -1,7 +1,8 @@
+from datetime import date, timedelta
 import pytest
 from app.task_manager import TaskManager
 from app.service import (
-    list_tasks, add_task, edit_task, update_status, delete_task, search_tasks, edit_task_by_field
+    list_tasks, add_task, edit_task, update_status, delete_task, search_tasks, edit_task_by_field, show_diagnostics
 )
 
 
@@ -46,6 +47,11 @@ def test_list_tasks(tasks_manager, monkeypatch, capsys):
     output = capsys.readouterr().out
     assert "Введена пустая строка!" in output
 
+    list_tasks(tasks_manager, option="3")
+    output = capsys.readouterr().out
+    assert "Ближайшие задачи:" in output
+    assert "Изучить Python" in output
+
 
 def test_add_task(tasks_manager, monkeypatch, capsys):
     """Тест функции добавления задачи"""
@@ -289,3 +295,119 @@ def test_search_tasks(tasks_manager, monkeypatch, capsys):
     search_tasks(tasks_manager, option="3")
     output = capsys.readouterr().out
     assert "Задачи по заданному запросу не найдены" in output
+
+
+def test_search_tasks_by_fields(tasks_manager, monkeypatch, capsys):
+    """Тест функции поиска задач по нескольким критериям"""
+    tasks_manager.add_task(
+        title="Изучить Python",
+        description="Пройти основы языка",
+        category="Обучение",
+        due_date="30.01.2025",
+        priority="высокий"
+    )
+    tasks_manager.add_task(
+        title="Изучить Flask",
+        description="Основы Flask",
+        category="Обучение",
+        due_date="01.01.2025",
+        priority="низкий"
+    )
+
+    capsys.readouterr()
+    inputs = iter(["основы", "обучение", "", "важный", "низкий", "01/01/2025", "31.01.2025"])
+    monkeypatch.setattr("builtins.input", lambda _: next(inputs))
+    search_tasks(tasks_manager, option="4")
+    output = capsys.readouterr().out
+    assert "Некорректный приоритет задачи! Используйте: низкий, средний или высокий" in output
+    assert "Некорректный формат даты! Используйте формат дд.мм.гггг" in output
+    assert "Изучить Flask" in output
+    assert "Изучить Python" not in output
+
+    inputs = iter(["", "", "", "", ""])
+    monkeypatch.setattr("builtins.input", lambda _: next(inputs))
+    search_tasks(tasks_manager, option="4")
+    output = capsys.readouterr().out
+    assert "Не указаны критерии для поиска задач" in output
+
+    inputs = iter(["Python", "отмена"])
+    monkeypatch.setattr("builtins.input", lambda _: next(inputs))
+    search_tasks(tasks_manager, option="4")
+    output = capsys.readouterr().out
+    assert "Поиск задач отменен" in output
+    assert "Изучить Python" not in output
+
+
+def test_search_tasks_by_due_date(tasks_manager, monkeypatch, capsys):
+    """Тест поиска задач по интервалу срока выполнения, просроченных и ближайших задач"""
+    tasks_manager.add_task(
+        title="Изучить Python",
+        description="Пройти основы языка",
+        category="Обучение",
+        due_date="30.01.2025",
+        priority="высокий"
+    )
+    tasks_manager.add_task(
+        title="Изучить Flask",
+        description="Основы Flask",
+        category="Обучение",
+        due_date=f"{date.today() + timedelta(days=3):%d.%m.%Y}",
+        priority="низкий"
+    )
+
+    capsys.readouterr()
+    inputs = iter(["01.01.2025", "31/01/2025", "31.01.2025"])
+    monkeypatch.setattr("builtins.input", lambda _: next(inputs))
+    search_tasks(tasks_manager, option="5")
+    output = capsys.readouterr().out
+    assert "Некорректный формат даты! Используйте формат дд.мм.гггг" in output
+    assert "Изучить Python" in output
+    assert "Изучить Flask" not in output
+
+    search_tasks(tasks_manager, option="6")
+    output = capsys.readouterr().out
+    assert "Изучить Python" in output
+    assert "Изучить Flask" not in output
+
+    inputs = iter(["неделя", "7"])
+    monkeypatch.setattr("builtins.input", lambda _: next(inputs))
+    search_tasks(tasks_manager, option="7")
+    output = capsys.readouterr().out
+    assert "Некорректное количество дней!" in output
+    assert "Изучить Flask" in output
+    assert "Изучить Python" not in output
+
+
+def test_list_tasks_pages(tasks_manager, monkeypatch, capsys):
+    """Тест переключения страниц списка задач"""
+    for number in range(3):
+        tasks_manager.add_task(
+            title=f"Задача {number}",
+            description="Описание задачи",
+            category="Работа",
+            due_date="30.01.2025",
+            priority="средний"
+        )
+
+    capsys.readouterr()
+    inputs = iter(["2", "1", "1", "1", "2", "3"])
+    monkeypatch.setattr("builtins.input", lambda _: next(inputs))
+    list_tasks(tasks_manager, option="1", page_size=2)
+    output = capsys.readouterr().out
+    assert "Это первая страница" in output
+    assert "Это последняя страница" in output
+    assert output.count("Задача 0") == 2
+    assert output.count("Задача 2") == 1
+    assert "Возврат в основное меню..." in output
+
+
+def test_show_diagnostics(tasks_manager, capsys):
+    """Тест скрытого пункта диагностики"""
+    show_diagnostics(tasks_manager)
+    assert "Сбор статистики включен" in capsys.readouterr().out
+
+    tasks_manager.list_tasks()
+    show_diagnostics(tasks_manager)
+    output = capsys.readouterr().out
+    assert "Время операций (мкс):" in output
+    assert "list_tasks: вызовов - 1" in output
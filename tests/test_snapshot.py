@@ -0,0 +1,46 @@
+import json
+import struct
+import pytest
+from app.snapshot import HEADER, MAGIC, VERSION, decode_snapshot, encode_snapshot
+from app.task import Task
+
+
+@pytest.fixture
+def tasks():
+    """Создает набор задач с повторяющимися категориями"""
+    return [Task(f"Задача {number}", f"Описание задачи {number}", ("Работа", "Личное")[number % 2],
+                 "30.01.2025", ("высокий", "средний", "низкий")[number % 3]) for number in range(30)]
+
+
+@pytest.mark.parametrize("compression", [None, "gzip", "lzma"])
+def test_snapshot_round_trip(tasks, compression):
+    """Тест кодирования и декодирования задач с разными способами сжатия"""
+    tasks[0].status = "выполнена"
+    data = encode_snapshot(tasks, compression)
+    assert data.startswith(MAGIC)
+    decoded = list(decode_snapshot(data))
+    assert [task.to_dict() for task in decoded] == [task.to_dict() for task in tasks]
+    assert decoded[1].category is decoded[3].category
+
+
+def test_snapshot_size(tasks):
+    """Тест хранения повторяющихся строк в таблице снимка"""
+    data = encode_snapshot(tasks)
+    assert data.count("Работа".encode("utf-8")) == 1
+    assert len(data) < len(json.dumps([task.to_dict() for task in tasks], ensure_ascii=False).encode("utf-8"))
+    assert len(encode_snapshot(tasks, "gzip")) < len(data)
+
+
+def test_snapshot_errors(tasks):
+    """Тест отказа читать чужие, поврежденные и более новые снимки"""
+    data = encode_snapshot(tasks)
+    with pytest.raises(ValueError, match="не является"):
+        list(decode_snapshot(b"[]" + data))
+    with pytest.raises(ValueError, match="поврежден"):
+        list(decode_snapshot(MAGIC))
+    with pytest.raises(ValueError, match="не поддерживается"):
+        list(decode_snapshot(HEADER.pack(MAGIC, VERSION + 1, 0) + data[HEADER.size:]))
+    with pytest.raises(ValueError, match="сжатия"):
+        encode_snapshot(tasks, "zip")
+    assert list(decode_snapshot(encode_snapshot([]))) == []
+    assert struct.unpack_from("<H", data, len(MAGIC)) == (VERSION,)
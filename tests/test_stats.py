@@ -0,0 +1,66 @@
+import os
+import pytest
+from app.stats import Histogram
+from app.task_manager import TaskManager
+
+
+def test_histogram():
+    """Тест гистограммы значений по степеням двойки"""
+    histogram = Histogram()
+    for value in [1, 3, 3, 100]:
+        histogram.add(value)
+    summary = histogram.summary()
+    assert summary["count"] == 4
+    assert summary["mean"] == 26.75
+    assert summary["buckets"] == {2: 1, 4: 2, 128: 1}
+    assert histogram.percentile(50) == 4
+    assert histogram.percentile(99) == 100
+
+
+def test_stats(tmp_path):
+    """Тест сбора статистики операций и ее отключения"""
+    test_file = f"{tmp_path}/test_tasks.json"
+    task_manager = TaskManager(test_file, verbose=False)
+    stats = task_manager.enable_stats(profile=True)
+    assert task_manager.enable_stats() is stats
+
+    task = task_manager.add_task("Изучить Python", "Пройти основы языка", "Обучение", "30.01.2025", "высокий")
+    task_manager.add_task("Изучить Flask", "Основы Flask", "Обучение", "01.01.2025", "низкий")
+    size = os.path.getsize(test_file)
+    task_manager.update_status(task.id)
+    task_manager.query(keyword="основы", status="не выполнена")
+
+    snapshot = stats.snapshot()
+    assert snapshot["latency_us"]["add_task"]["count"] == 2
+    assert snapshot["latency_us"]["query"]["count"] == 1
+    assert snapshot["bytes_written"]["count"] == 3
+    # Каждое изменение перезаписывает файл JSON целиком, и учитывается весь записанный объем
+    assert snapshot["bytes_written"]["max"] == size
+    assert snapshot["bytes_written"]["min"] < size
+    assert snapshot["latency_us"]["load"]["count"] == 1
+    assert snapshot["query_scanned"]["total"] == 1
+    assert snapshot["query_results"]["total"] == 1
+    report = stats.report()
+    assert "add_task: вызовов - 2" in report
+    assert "cumulative" in report
+
+    assert task_manager.disable_stats() is stats
+    assert task_manager.stats is None
+    assert "add_task" not in vars(task_manager)
+    task_manager.query(keyword="основы")
+    assert stats.snapshot()["latency_us"]["query"]["count"] == 1
+
+
+@pytest.mark.parametrize("filename", ["test_tasks.jsonl", "test_tasks.db", "tasks/"])
+def test_stats_bytes_written(tmp_path, filename):
+    """Тест учета объема записи для дозаписи, базы SQLite и каталога категорий"""
+    task_manager = TaskManager(f"{tmp_path}/{filename}", verbose=False)
+    task_manager.add_task("Изучить Python", "Пройти основы языка", "Обучение", "30.01.2025", "высокий")
+    stats = task_manager.enable_stats()
+    size = os.path.getsize(f"{tmp_path}/{filename}") if filename.endswith(".jsonl") else None
+    task_manager.add_task("Изучить Flask", "Основы Flask", "Обучение", "01.01.2025", "низкий")
+    written = stats.snapshot()["bytes_written"]["total"]
+    if size is not None:  # Дозапись учитывает только дописанную строку
+        assert written == os.path.getsize(f"{tmp_path}/{filename}") - size
+    assert written > len("Изучить FlaskОсновы Flask".encode("utf-8"))
+    task_manager.close()
@@ -0,0 +1,307 @@
+import os
+from datetime import date
+import pytest
+from app.storage import (UMASK, BinaryStorage, JsonLinesStorage, JsonStorage, ShardedStorage, SqliteStorage,
+                         atomic_write, convert_binary_to_json, open_storage)
+from app.task import Task
+from app.task_manager import TaskManager
+
+
+@pytest.fixture
+def sqlite_manager(tmp_path):
+    """Создает временный экземпляр TaskManager с базой SQLite"""
+    task_manager = TaskManager(f"{tmp_path}/test_tasks.db")
+    yield task_manager
+    task_manager.close()
+
+
+def add_tasks(task_manager):
+    task_manager.add_task(
+        title="Изучить Python",
+        description="Пройти основы языка",
+        category="Обучение",
+        due_date="30.01.2025",
+        priority="высокий"
+    )
+    task_manager.add_task(
+        title="Пройти курс Django",
+        description="Изучить основы Django",
+        category="Работа",
+        due_date="20.12.2024",
+        priority="средний"
+    )
+    task_manager.add_task(
+        title="Изучить Flask",
+        description="Основы Flask",
+        category="Обучение",
+        due_date="01.01.2025",
+        priority="низкий"
+    )
+    return [task.id for task in task_manager.tasks]
+
+
+def test_open_storage(tmp_path):
+    """Тест выбора хранилища по расширению файла"""
+    assert isinstance(open_storage(f"{tmp_path}/tasks.json"), JsonStorage)
+    assert isinstance(open_storage(f"{tmp_path}/tasks.bin"), BinaryStorage)
+    assert isinstance(open_storage(f"{tmp_path}/tasks/"), ShardedStorage)
+    storage = open_storage(f"{tmp_path}/tasks.db")
+    assert isinstance(storage, SqliteStorage)
+    storage.close()
+
+
+def test_sqlite_storage(sqlite_manager, tmp_path):
+    """Тест построчного сохранения изменений в SQLite"""
+    first_id, second_id, third_id = add_tasks(sqlite_manager)
+    sqlite_manager.edit_task(first_id, category="Работа", due_date="01.12.2024")
+    sqlite_manager.update_status(second_id)
+    sqlite_manager.delete_tasks(task_id=third_id)
+
+    storage = SqliteStorage(f"{tmp_path}/test_tasks.db")
+    tasks = list(storage.load())
+    assert [task.to_dict() for task in tasks] == [task.to_dict() for task in sqlite_manager.tasks]
+    assert tasks[0].category == "Работа"
+    assert tasks[1].status == "выполнена"
+    storage.close()
+
+
+def test_sqlite_query(sqlite_manager):
+    """Тест поиска задач средствами SQL"""
+    first_id, second_id, third_id = add_tasks(sqlite_manager)
+    storage = sqlite_manager.storage
+
+    assert [task.id for task in storage.query(keyword="ОСНОВЫ")] == [first_id, second_id, third_id]
+    assert [task.id for task in storage.query(keyword="основы", category="обучение")] == [first_id, third_id]
+    assert [task.id for task in storage.query(priority="Средний")] == [second_id]
+    assert [task.id for task in storage.query(due_before=date(2025, 1, 1))] == [second_id, third_id]
+    assert [task.id for task in storage.query(due_after=date(2025, 1, 1))] == [first_id, third_id]
+    assert storage.query(status="выполнена") == []
+    assert storage.get_task(second_id).title == "Пройти курс Django"
+    assert storage.get_task(third_id + 1) is None
+
+
+def test_sqlite_lazy_manager(sqlite_manager):
+    """Тест ленивого режима: get_task и query выполняются запросами к базе без загрузки всех задач"""
+    first_id, second_id, third_id = add_tasks(sqlite_manager)
+    sqlite_manager.update_status(second_id)
+    task_manager = TaskManager(sqlite_manager.filename, lazy=True)
+    assert not hasattr(task_manager, "_tasks")
+    assert task_manager.get_task(second_id).status == "выполнена"
+    assert [task.id for task in task_manager.query(keyword="основы", due_after=date(2025, 1, 1))] == \
+        [first_id, third_id]
+    assert [task.id for task in task_manager.get_tasks(category="обучение")] == [first_id, third_id]
+    assert not hasattr(task_manager, "_tasks")
+
+    task_manager.delete_tasks(task_id=first_id)
+    assert [task.id for task in task_manager.tasks] == [second_id, third_id]
+    task_manager.close()
+
+
+def test_jsonl_storage(tmp_path):
+    """Тест хранения задач в формате JSON Lines"""
+    task_manager = TaskManager(f"{tmp_path}/test_tasks.jsonl")
+    first_id, second_id, third_id = add_tasks(task_manager)
+    lines = (tmp_path / "test_tasks.jsonl").read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 3
+
+    task_manager.update_status(first_id)
+    task_manager.delete_tasks(task_id=second_id)
+    reloaded = TaskManager(f"{tmp_path}/test_tasks.jsonl")
+    assert [task.to_dict() for task in reloaded.tasks] == [task.to_dict() for task in task_manager.tasks]
+    assert reloaded.get_task(first_id).status == "выполнена"
+
+
+def test_jsonl_torn_line(tmp_path):
+    """Тест дозаписи задач после строки, недописанной при аварийном завершении"""
+    test_file = f"{tmp_path}/test_tasks.jsonl"
+    task_manager = TaskManager(test_file)
+    task_manager.add_task("Первая", "Описание", "Работа", "30.01.2025", "высокий")
+    with open(test_file, "ab") as file:
+        file.write('{"id":2,"title":"Об'.encode("utf-8")[:-1])
+
+    restarted = TaskManager(test_file)
+    restarted.add_task("Вторая", "Описание", "Работа", "30.01.2025", "высокий")
+    restarted.add_task("Третья", "Описание", "Работа", "30.01.2025", "высокий")
+    reloaded = TaskManager(test_file)
+    assert [task.title for task in reloaded.tasks] == ["Первая", "Вторая", "Третья"]
+
+
+def test_jsonl_conversion(tmp_path):
+    """Тест автоматического перевода tasks.json в формат JSON Lines"""
+    task_manager = TaskManager(f"{tmp_path}/test_tasks.json")
+    add_tasks(task_manager)
+
+    converted = TaskManager(f"{tmp_path}/test_tasks.jsonl")
+    assert isinstance(converted.storage, JsonLinesStorage)
+    assert (tmp_path / "test_tasks.jsonl").exists()
+    assert [task.to_dict() for task in converted.tasks] == [task.to_dict() for task in task_manager.tasks]
+
+
+def test_atomic_write(tmp_path):
+    """Тест сохранения прежнего содержимого файла при сбое записи"""
+    filename = tmp_path / "test_tasks.json"
+    filename.write_text("[]", encoding="utf-8")
+
+    with pytest.raises(OSError):
+        with atomic_write(str(filename)) as file:
+            file.write("[{")
+            raise OSError("No space left on device")
+    assert filename.read_text(encoding="utf-8") == "[]"
+    assert [path.name for path in tmp_path.iterdir()] == ["test_tasks.json"]
+
+    with atomic_write(str(filename)) as file:
+        file.write("[ ]")
+    assert filename.read_text(encoding="utf-8") == "[ ]"
+
+
+@pytest.mark.skipif(os.name != "posix", reason="права доступа POSIX")
+def test_atomic_write_mode(tmp_path):
+    """Тест прав нового файла по маске процесса и сохранения прав существующего файла"""
+    filename = tmp_path / "test_tasks.json"
+    with atomic_write(str(filename)) as file:
+        file.write("[]")
+    assert filename.stat().st_mode & 0o777 == 0o666 & ~UMASK
+
+    filename.chmod(0o640)
+    with atomic_write(str(filename)) as file:
+        file.write("[ ]")
+    assert filename.stat().st_mode & 0o777 == 0o640
+
+
+def test_compact_json(tmp_path):
+    """Тест компактной записи JSON без отступов"""
+    task_manager = TaskManager(f"{tmp_path}/test_tasks.json", indent=None)
+    add_tasks(task_manager)
+    content = (tmp_path / "test_tasks.json").read_text(encoding="utf-8")
+    assert "\n" not in content
+    assert '"id":' in content and '": ' not in content
+    assert len(TaskManager(f"{tmp_path}/test_tasks.json").tasks) == 3
+
+
+def test_binary_storage(tmp_path):
+    """Тест хранения задач в двоичном снимке со сжатием"""
+    task_manager = TaskManager(f"{tmp_path}/test_tasks.bin", compression="gzip")
+    first_id, second_id, _ = add_tasks(task_manager)
+    task_manager.update_status(first_id)
+    task_manager.delete_tasks(task_id=second_id)
+    assert (tmp_path / "test_tasks.bin").read_bytes()[:4] == b"TSKB"
+
+    reloaded = TaskManager(f"{tmp_path}/test_tasks.bin")
+    assert [task.to_dict() for task in reloaded.tasks] == [task.to_dict() for task in task_manager.tasks]
+    assert reloaded.get_task(first_id).status == "выполнена"
+    new_task = reloaded.add_task("Новая задача", "Описание", "Работа", "01.02.2025", "низкий")
+    assert new_task.id > max(task.id for task in task_manager.tasks)
+
+
+def test_binary_conversion(tmp_path):
+    """Тест перевода tasks.json в двоичный снимок и обратно"""
+    task_manager = TaskManager(f"{tmp_path}/test_tasks.json")
+    add_tasks(task_manager)
+
+    converted = TaskManager(f"{tmp_path}/test_tasks.bin")
+    assert isinstance(converted.storage, BinaryStorage)
+    assert [task.to_dict() for task in converted.tasks] == [task.to_dict() for task in task_manager.tasks]
+
+    convert_binary_to_json(f"{tmp_path}/test_tasks.bin", f"{tmp_path}/restored.json")
+    assert (tmp_path / "restored.json").read_text(encoding="utf-8") == \
+        (tmp_path / "test_tasks.json").read_text(encoding="utf-8")
+
+
+def test_sharded_storage(tmp_path, monkeypatch):
+    """Тест хранения задач в отдельных файлах по категориям"""
+    directory = tmp_path / "tasks"
+    task_manager = TaskManager(f"{directory}/")
+    first_id, second_id, third_id = add_tasks(task_manager)
+    assert sorted(path.name for path in directory.iterdir()) == ["manifest.json", "обучение.jsonl", "работа.jsonl"]
+    assert [task.id for task in task_manager.storage.load_category("ОБУЧЕНИЕ")] == [first_id, third_id]
+
+    # Изменение задачи перезаписывает только файл ее категории
+    saved = []
+    monkeypatch.setattr(JsonLinesStorage, "save", lambda self, tasks: saved.append(os.path.basename(self.filename)))
+    task_manager.update_status(second_id)
+    assert saved == ["работа.jsonl"]
+    monkeypatch.undo()
+
+    task_manager.edit_task(first_id, category="Работа")
+    assert [task.id for task in task_manager.storage.load_category("работа")] == [first_id, second_id]
+    assert [task.id for task in task_manager.storage.load_category("обучение")] == [third_id]
+
+    task_manager.delete_tasks(category="обучение")
+    assert sorted(path.name for path in directory.iterdir()) == ["manifest.json", "работа.jsonl"]
+
+    # ID задач удаленной категории не выдаются повторно и в новом процессе
+    monkeypatch.setattr(Task, "_counter", 0)
+    reloaded = TaskManager(str(directory))
+    assert [task.to_dict() for task in reloaded.tasks] == [task.to_dict() for task in task_manager.tasks]
+    new_task = reloaded.add_task("Новая задача", "Описание", "Дом/Сад", "01.02.2025", "низкий")
+    assert new_task.id == third_id + 1
+    assert ShardedStorage.shard_name("Дом/Сад") != ShardedStorage.shard_name("Дом_Сад")
+    assert [task.id for task in reloaded.storage.load_category("дом/сад")] == [new_task.id]
+
+
+def test_sharded_storage_move_delete(tmp_path):
+    """Тест переноса задачи в другую категорию и ее удаления в одной пакетной операции"""
+    directory = tmp_path / "tasks"
+    task_manager = TaskManager(f"{directory}/", verbose=False)
+    first_id, second_id, third_id = add_tasks(task_manager)
+    with task_manager.batch():
+        task_manager.edit_task(first_id, category="Дом")
+        task_manager.delete_tasks(task_id=first_id)
+        task_manager.edit_task(second_id, category="Дом")
+        task_manager.edit_task(second_id, category="Обучение")
+        task_manager.edit_task(third_id, category="Дом")
+        task_manager.edit_task(third_id, category="Обучение")
+    assert sorted(path.name for path in directory.iterdir()) == ["manifest.json", "обучение.jsonl"]
+    reloaded = TaskManager(str(directory), verbose=False)
+    assert [task.to_dict() for task in reloaded.tasks] == [task.to_dict() for task in task_manager.tasks]
+    assert [task.id for task in reloaded.tasks] == [second_id, third_id]
+
+
+def test_sharded_storage_crash(tmp_path, monkeypatch):
+    """Тест сохранности задач при сбое между записью файлов категорий и манифеста"""
+    directory = tmp_path / "tasks"
+    task_manager = TaskManager(f"{directory}/", verbose=False)
+    first_id, second_id, third_id = add_tasks(task_manager)
+
+    def crash(*args, **kwargs):
+        raise OSError("Сбой записи")
+
+    # Сбой до записи манифеста: файл новой категории уже записан, но манифест о нем не знает
+    monkeypatch.setattr(ShardedStorage, "_save_manifest", crash)
+    with pytest.raises(OSError):
+        task_manager.add_task("Новая задача", "Описание", "Дом", "01.02.2025", "низкий")
+    monkeypatch.undo()
+    monkeypatch.setattr(Task, "_counter", 0)
+    task_manager = TaskManager(str(directory), verbose=False)
+    assert [task.category for task in task_manager.get_tasks(category="дом")] == ["Дом"]
+    assert task_manager.add_task("Задача", "Описание", "Дом", "01.02.2025", "низкий").id == third_id + 2
+
+    # Сбой до удаления файла прежней категории: перенесенная задача загружается один раз
+    monkeypatch.setattr(os, "remove", crash)
+    with pytest.raises(OSError):
+        task_manager.edit_task(second_id, category="Обучение")
+    monkeypatch.undo()
+    task_manager = TaskManager(str(directory), verbose=False)
+    assert [task.id for task in task_manager.get_tasks(category="Обучение")] == [first_id, second_id, third_id]
+    assert len(task_manager.tasks) == 5
+    task_manager.update_status(first_id)
+    assert "работа.jsonl" not in os.listdir(directory)
+
+    # Сбой при встречном переносе задач между категориями не теряет ни одну из них
+    saves = []
+    save = JsonLinesStorage.save
+
+    def crash_second_save(storage, tasks):
+        saves.append(storage.filename)
+        if len(saves) == 2:
+            crash()
+        save(storage, tasks)
+
+    monkeypatch.setattr(JsonLinesStorage, "save", crash_second_save)
+    with pytest.raises(OSError):
+        with task_manager.batch():
+            task_manager.edit_task(first_id, category="Дом")
+            task_manager.edit_task(third_id + 2, category="Обучение")
+    monkeypatch.undo()
+    reloaded = TaskManager(str(directory), verbose=False)
+    assert sorted(task.id for task in reloaded.tasks) == sorted(task.id for task in task_manager.tasks)
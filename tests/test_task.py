@@ -0,0 +1,56 @@
+from datetime import date
+import pytest
+from app.task import Priority, Status, Task
+
+
+def test_task_codes():
+    """Тест хранения приоритета и статуса кодами"""
+    task = Task("Изучить Python", "Пройти основы языка", "Обучение", "30.01.2025", "Высокий")
+    assert not hasattr(task, "__dict__")
+    assert task._priority is Priority.HIGH
+    assert task._status is Status.OPEN
+    assert task.priority == "высокий"
+    assert task.status == "не выполнена"
+
+    task.status = "выполнена"
+    assert task._status is Status.DONE
+    assert task.to_dict()["status"] == "выполнена"
+    assert "Приоритет: высокий, Статус: выполнена" in task.present_task()
+
+    with pytest.raises(ValueError):
+        task.priority = "срочный"
+
+
+def test_task_category_interned():
+    """Тест разделения одинаковых категорий между задачами"""
+    first = Task.from_dict({"id": 1, "title": "Изучить Python", "description": "Пройти основы языка",
+                            "category": "".join(["Обуч", "ение"]), "due_date": "30.01.2025",
+                            "priority": "высокий", "status": "не выполнена"})
+    second = Task("Изучить Flask", "Основы Flask", "".join(["Обу", "чение"]), "01.01.2025", "низкий")
+    assert first.category is second.category
+
+
+def test_task_due_ordinal():
+    """Тест хранения срока выполнения порядковым номером дня"""
+    task = Task("Изучить Python", "Пройти основы языка", "Обучение", "30.01.2025", "высокий")
+    assert task.due_ordinal == date(2025, 1, 30).toordinal()
+    assert task.due_date == "30.01.2025"
+    assert task.to_dict()["due_date"] == "30.01.2025"
+
+    task.due_date = "01.02.2025"
+    assert task.due_ordinal == date(2025, 2, 1).toordinal()
+
+    with pytest.raises(ValueError):
+        task.due_date = "31.02.2025"
+
+
+def test_task_present_cache():
+    """Тест сброса кэшированного представления задачи при изменении полей"""
+    task = Task("Изучить Python", "Пройти основы языка", "Обучение", "30.01.2025", "высокий")
+    text = task.present_task()
+    assert task.present_task() is text
+
+    for field, value in [("title", "Изучить Flask"), ("description", "Основы Flask"), ("category", "Работа"),
+                         ("due_date", "01.01.2025"), ("priority", "низкий"), ("status", "выполнена")]:
+        setattr(task, field, value)
+        assert value in task.present_task()
@@ -1,5 +1,8 @@
+import threading
+from datetime import date
 import pytest
-from app.task_manager import TaskManager
+from app.task import Task
+from app.task_manager import TaskManager, write_lines
 
 
 @pytest.fixture
@@ -84,6 +87,15 @@ def test_get_task(task_manager):
     assert task is None
 
 
+def test_has_tasks(task_manager):
+    """Тест проверки наличия задач"""
+    assert not task_manager.has_tasks()
+    task = task_manager.add_task("Изучить Python", "Пройти основы языка", "Обучение", "30.01.2025", "высокий")
+    assert task_manager.has_tasks()
+    task_manager.delete_tasks(task_id=task.id)
+    assert not task_manager.has_tasks()
+
+
 def test_get_tasks(task_manager):
     """Тест получения задач по ключевому слову, категории или статусу"""
     task_manager.add_task(
@@ -231,6 +243,34 @@ def test_delete_tasks_by_category(task_manager, capsys):
     assert "Задачи из категории 'Обучение' не найдены" in output
 
 
+def test_delete_category_indexes(task_manager):
+    """Тест согласованности индексов после удаления категории и его отмены"""
+    for number in range(9):
+        task_manager.add_task(
+            title=f"Задача {number}",
+            description="Описание задачи",
+            category=("Работа", "Обучение", "Дом")[number % 3],
+            due_date=f"{number + 10}.01.2025",
+            priority=("низкий", "средний", "высокий")[number % 3]
+        )
+    kept = [task for task in task_manager.tasks if task.category != "Обучение"]
+
+    with pytest.raises(RuntimeError):
+        with task_manager.batch():
+            task_manager.delete_tasks(category="обучение")
+            assert task_manager.tasks == kept
+            raise RuntimeError
+    assert len(task_manager.get_tasks(category="Обучение")) == 3
+
+    task_manager.delete_tasks(category="Обучение")
+    assert task_manager.tasks == kept
+    assert task_manager.get_tasks(category="Обучение") == []
+    assert task_manager.query(priority="средний") == []
+    assert task_manager.query(keyword="задача") == kept
+    assert task_manager.due_between(date(2025, 1, 10), date(2025, 1, 18)) == kept
+    assert [task.title for task in task_manager.next_tasks(9)] == [f"Задача {number}" for number in (2, 5, 8, 0, 3, 6)]
+
+
 def test_search_tasks(task_manager, capsys):
     """Тест поиска задач"""
     task_manager.add_task(
@@ -267,3 +307,567 @@ def test_search_tasks(task_manager, capsys):
     task_manager.search_tasks(status="выполнена")
     output = capsys.readouterr().out
     assert "Задачи по заданному запросу не найдены" in output
+
+
+def test_journal(tmp_path, capsys):
+    """Тест журнала операций: дозапись изменений, восстановление и сжатие"""
+    test_file = f"{tmp_path}/test_tasks.json"
+    task_manager = TaskManager(test_file, journal=True, compact_threshold=4)
+    task_manager.add_task(
+        title="Изучить Python",
+        description="Пройти основы языка",
+        category="Обучение",
+        due_date="30.01.2025",
+        priority="высокий"
+    )
+    task_manager.add_task(
+        title="Пройти курс Django",
+        description="Изучить основы Django",
+        category="Работа",
+        due_date="20.12.2024",
+        priority="средний"
+    )
+    first_id, second_id = (task.id for task in task_manager.tasks)
+    task_manager.update_status(first_id)
+
+    # Снимок не создается, все изменения находятся в журнале
+    assert task_manager.storage.journal.size == 3
+    assert not (tmp_path / "test_tasks.json").exists()
+
+    reloaded = TaskManager(test_file, journal=True, compact_threshold=4)
+    assert [task.id for task in reloaded.tasks] == [first_id, second_id]
+    assert reloaded.get_task(first_id).status == "выполнена"
+
+    # Четвертая запись приводит к сжатию журнала в снимок
+    task_manager.delete_tasks(task_id=second_id)
+    assert task_manager.storage.journal.size == 0
+    assert (tmp_path / "test_tasks.json").exists()
+
+    reloaded = TaskManager(test_file, journal=True)
+    assert [task.id for task in reloaded.tasks] == [first_id]
+    assert reloaded.get_task(first_id).status == "выполнена"
+
+
+def test_journal_torn_line(tmp_path):
+    """Тест дозаписи в журнал после строки, недописанной при аварийном завершении"""
+    test_file = f"{tmp_path}/test_tasks.json"
+    task_manager = TaskManager(test_file, journal=True)
+    task_manager.add_task("Первая", "Описание", "Работа", "30.01.2025", "высокий")
+    with open(f"{test_file}.log", "ab") as file:
+        file.write('{"op":"add","task":{"title":"Об'.encode("utf-8")[:-1])
+
+    restarted = TaskManager(test_file, journal=True)
+    restarted.add_task("Вторая", "Описание", "Работа", "30.01.2025", "высокий")
+    restarted.add_task("Третья", "Описание", "Работа", "30.01.2025", "высокий")
+    reloaded = TaskManager(test_file, journal=True)
+    assert [task.title for task in reloaded.tasks] == ["Первая", "Вторая", "Третья"]
+
+
+def test_edit_task_invalid_field(tmp_path):
+    """Тест отказа от всех изменений задачи, если одно из полей некорректно"""
+    test_file = f"{tmp_path}/test_tasks.json"
+    task_manager = TaskManager(test_file)
+    task = task_manager.add_task("Изучить Python", "Пройти основы языка", "Обучение", "30.01.2025", "высокий")
+
+    with pytest.raises(ValueError):
+        task_manager.edit_task(task.id, title="Изучить Django", category="Работа", due_date="99.99.2025")
+    with pytest.raises(ValueError):
+        task_manager.edit_task(task.id, title="Изучить Django", priority="срочный")
+    assert (task.title, task.category, task.due_date, task.priority) == (
+        "Изучить Python", "Обучение", "30.01.2025", "высокий")
+    assert task_manager.query(keyword="django") == []
+    assert task_manager.query(category="Обучение") == [task]
+
+    task_manager.update_status(task.id)
+    assert [task.title for task in TaskManager(test_file).tasks] == ["Изучить Python"]
+
+
+def test_category_index(task_manager):
+    """Тест индекса категорий при изменении категории задачи"""
+    task_manager.add_task(
+        title="Изучить Python",
+        description="Пройти основы языка",
+        category="Обучение",
+        due_date="30.01.2025",
+        priority="высокий"
+    )
+    task_manager.add_task(
+        title="Пройти курс Django",
+        description="Изучить основы Django",
+        category="Работа",
+        due_date="20.12.2024",
+        priority="средний"
+    )
+    task_id = task_manager.tasks[0].id
+
+    task_manager.edit_task(task_id, category="Работа")
+    assert task_manager.get_tasks(category="обучение") == []
+    assert [task.title for task in task_manager.get_tasks(category="РАБОТА")] == [
+        "Изучить Python", "Пройти курс Django"
+    ]
+
+    task_manager.delete_tasks(category="работа")
+    assert task_manager.tasks == []
+    assert task_manager.get_tasks(category="Работа") == []
+
+
+def test_keyword_index(task_manager):
+    """Тест поиска по ключевому слову после изменения и удаления задач"""
+    task_manager.add_task(
+        title="Изучить Python",
+        description="Пройти основы языка",
+        category="Обучение",
+        due_date="30.01.2025",
+        priority="высокий"
+    )
+    task_manager.add_task(
+        title="Пройти курс Django",
+        description="Изучить основы Django",
+        category="Работа",
+        due_date="20.12.2024",
+        priority="средний"
+    )
+    first_id, second_id = (task.id for task in task_manager.tasks)
+
+    assert [task.id for task in task_manager.get_tasks(keyword="ОСНОВЫ Я")] == [first_id]
+    assert [task.id for task in task_manager.get_tasks(keyword="dj")] == [second_id]
+    assert task_manager.get_tasks(keyword="Flask") == []
+
+    task_manager.edit_task(first_id, title="Изучить Flask")
+    assert [task.id for task in task_manager.get_tasks(keyword="flask")] == [first_id]
+    assert task_manager.get_tasks(keyword="Python") == []
+
+    task_manager.delete_tasks(task_id=second_id)
+    assert [task.id for task in task_manager.get_tasks(keyword="основы")] == [first_id]
+
+
+def test_query(task_manager):
+    """Тест поиска задач по нескольким критериям одновременно"""
+    task_manager.add_task(
+        title="Изучить Python",
+        description="Пройти основы языка",
+        category="Обучение",
+        due_date="30.01.2025",
+        priority="высокий"
+    )
+    task_manager.add_task(
+        title="Пройти курс Django",
+        description="Изучить основы Django",
+        category="Работа",
+        due_date="20.12.2024",
+        priority="средний"
+    )
+    task_manager.add_task(
+        title="Изучить Flask",
+        description="Основы Flask",
+        category="Обучение",
+        due_date="01.01.2025",
+        priority="низкий"
+    )
+    first_id, second_id, third_id = (task.id for task in task_manager.tasks)
+    task_manager.update_status(third_id)
+
+    tasks = task_manager.query(keyword="основы", category="обучение")
+    assert [task.id for task in tasks] == [first_id, third_id]
+
+    tasks = task_manager.query(keyword="основы", category="обучение", status="не выполнена")
+    assert [task.id for task in tasks] == [first_id]
+
+    tasks = task_manager.query(priority="средний", due_before=date(2024, 12, 31))
+    assert [task.id for task in tasks] == [second_id]
+
+    tasks = task_manager.query(category="Работа", priority="высокий")
+    assert tasks == []
+
+    assert len(task_manager.query()) == 3
+
+
+def test_due_index(task_manager):
+    """Тест запросов по сроку выполнения через упорядоченный индекс"""
+    for title, due_date in [("Отчет", "30.01.2025"), ("Презентация", "20.12.2024"),
+                            ("Встреча", "01.01.2025"), ("Звонок", "20.12.2024")]:
+        task_manager.add_task(
+            title=title,
+            description="Описание задачи",
+            category="Работа",
+            due_date=due_date,
+            priority="средний"
+        )
+    report, presentation, meeting, call = task_manager.tasks
+
+    tasks = task_manager.due_between(date(2024, 12, 20), date(2025, 1, 1))
+    assert tasks == [presentation, call, meeting]
+    assert task_manager.due_between(start=date(2025, 1, 2)) == [report]
+
+    task_manager.update_status(call.id)
+    assert task_manager.overdue(today=date(2025, 1, 1)) == [presentation]
+    assert task_manager.due_within(29, today=date(2025, 1, 1)) == [meeting, report]
+
+    tasks = task_manager.query(due_after=date(2024, 12, 21), due_before=date(2025, 1, 30))
+    assert tasks == [report, meeting]
+
+    task_manager.edit_task(presentation.id, due_date="15.02.2025")
+    assert task_manager.due_between(start=date(2025, 1, 2)) == [report, presentation]
+    task_manager.delete_tasks(task_id=report.id)
+    assert task_manager.due_between(start=date(2025, 1, 2)) == [presentation]
+
+
+def test_next_tasks(task_manager, capsys):
+    """Тест очереди ближайших задач по приоритету и сроку выполнения"""
+    for title, due_date, priority in [("Отчет", "30.01.2025", "средний"), ("Презентация", "20.12.2024", "высокий"),
+                                      ("Встреча", "01.01.2025", "высокий"), ("Звонок", "20.12.2024", "низкий")]:
+        task_manager.add_task(
+            title=title,
+            description="Описание задачи",
+            category="Работа",
+            due_date=due_date,
+            priority=priority
+        )
+    report, presentation, meeting, call = task_manager.tasks
+    assert task_manager.next_tasks(3) == [presentation, meeting, report]
+
+    task_manager.update_status(presentation.id)
+    task_manager.edit_task(call.id, priority="высокий", due_date="25.12.2024")
+    task_manager.delete_tasks(task_id=meeting.id)
+    assert task_manager.next_tasks(5) == [call, report]
+
+    for _ in range(10):
+        task_manager.edit_task(report.id, due_date="01.01.2026")
+        task_manager.edit_task(report.id, due_date="01.01.2025")
+    assert task_manager.next_tasks(1) == [call]
+
+    capsys.readouterr()
+    task_manager.show_next_tasks()
+    output = capsys.readouterr().out
+    assert "Ближайшие задачи:" in output
+    assert output.index("Звонок") < output.index("Отчет")
+
+
+def test_batch(task_manager, monkeypatch, capsys):
+    """Тест пакетной операции с одним сохранением"""
+    writes = []
+    write = task_manager.storage.write
+    monkeypatch.setattr(task_manager.storage, "write", lambda records, tasks: writes.append(list(records)))
+
+    tasks = task_manager.add_tasks([
+        {"title": "Изучить Python", "description": "Пройти основы языка", "category": "Обучение",
+         "due_date": "30.01.2025", "priority": "высокий"},
+        {"title": "Пройти курс Django", "description": "Изучить основы Django", "category": "Работа",
+         "due_date": "20.12.2024", "priority": "средний"},
+    ])
+    output = capsys.readouterr().out
+    assert len(writes) == 1 and len(writes[0]) == 2
+    assert "добавлена с ID" not in output
+    assert "Пакетная операция завершена: добавлено задач - 2, изменено - 0, удалено - 0" in output
+
+    monkeypatch.setattr(task_manager.storage, "write", write)
+    first_id, second_id = (task.id for task in tasks)
+    with task_manager.batch():
+        task_manager.edit_tasks({first_id: {"title": "Изучить Flask"}, second_id + 1: {"title": "Изучить Go"}})
+        task_manager.update_status(second_id)
+        task_manager.delete_tasks(task_id=first_id)
+    output = capsys.readouterr().out
+    assert "Пакетная операция завершена: добавлено задач - 0, изменено - 2, удалено - 1, не найдено - 1" in output
+
+    reloaded = TaskManager(task_manager.filename)
+    assert [task.to_dict() for task in reloaded.tasks] == [task.to_dict() for task in task_manager.tasks]
+
+
+def test_batch_rollback(task_manager, capsys):
+    """Тест отмены пакетной операции при ошибке"""
+    task_manager.add_task(
+        title="Изучить Python",
+        description="Пройти основы языка",
+        category="Обучение",
+        due_date="30.01.2025",
+        priority="высокий"
+    )
+    task_id = task_manager.tasks[0].id
+
+    with pytest.raises(ValueError):
+        with task_manager.batch():
+            task_manager.edit_task(task_id, title="Изучить Django", category="Работа")
+            task_manager.add_task(
+                title="Изучить Flask",
+                description="Основы Flask",
+                category="Обучение",
+                due_date="01.01.2025",
+                priority="низкий"
+            )
+            task_manager.delete_tasks(category="Обучение")
+            task_manager.edit_task(task_id, priority="срочный")
+    output = capsys.readouterr().out
+    assert "Пакетная операция отменена, изменения не сохранены" in output
+
+    assert len(task_manager.tasks) == 1
+    task = task_manager.get_task(task_id)
+    assert task.title == "Изучить Python"
+    assert [task.id for task in task_manager.get_tasks(category="Обучение")] == [task_id]
+    assert task_manager.get_tasks(category="Работа") == []
+    assert task_manager.get_tasks(keyword="Django") == []
+    assert [task.title for task in TaskManager(task_manager.filename).tasks] == ["Изучить Python"]
+
+
+def test_dirty_tracking(task_manager, monkeypatch, capsys):
+    """Тест отсутствия записи на диск, если задачи не изменились"""
+    task_manager.add_task(
+        title="Изучить Python",
+        description="Пройти основы языка",
+        category="Обучение",
+        due_date="30.01.2025",
+        priority="высокий"
+    )
+    task_id = task_manager.tasks[0].id
+
+    def fail(*args):
+        raise AssertionError("Запись на диск не ожидается")
+
+    monkeypatch.setattr(task_manager.storage, "write", fail)
+    monkeypatch.setattr(task_manager.storage, "save", fail)
+    task_manager.edit_task(task_id, title="Изучить Python", priority="высокий")
+    task_manager.edit_task(task_id + 1, title="Изучить Django")
+    task_manager.update_status(task_id + 1)
+    task_manager.delete_tasks(category="Работа")
+    task_manager.save_tasks()
+    output = capsys.readouterr().out
+    assert f"Данные задачи с ID {task_id} не изменились" in output
+
+
+def test_write_behind(tmp_path, monkeypatch):
+    """Тест фоновой записи: изменения объединяются и записываются при закрытии"""
+    test_file = f"{tmp_path}/test_tasks.json"
+    task_manager = TaskManager(test_file, write_behind=True, max_staleness=60)
+    writes = []
+    write = task_manager.storage.write
+
+    def counting_write(records, tasks):
+        writes.append(len(records))
+        write(records, tasks)
+
+    monkeypatch.setattr(task_manager.storage, "write", counting_write)
+    task = task_manager.add_task(
+        title="Изучить Python",
+        description="Пройти основы языка",
+        category="Обучение",
+        due_date="30.01.2025",
+        priority="высокий"
+    )
+    task_manager.edit_task(task.id, title="Изучить Django")
+    task_manager.update_status(task.id)
+    assert writes == []
+    assert not (tmp_path / "test_tasks.json").exists()
+
+    task_manager.save_tasks()
+    assert writes == [3]
+
+    task_manager.delete_tasks(task_id=task.id)
+    task_manager.close()
+    assert writes == [3, 1]
+    assert TaskManager(test_file).tasks == []
+
+
+def test_flush_during_batch(tmp_path):
+    """Тест записи из другого потока, пока пакетная операция не завершена"""
+    test_file = f"{tmp_path}/test_tasks.json"
+    task_manager = TaskManager(test_file, thread_safe=True, autoflush=False, verbose=False)
+    task_manager.add_task("Сохраненная", "Описание", "Работа", "30.01.2025", "высокий")
+    flushed = threading.Event()
+
+    def flush():
+        task_manager.flush()
+        flushed.set()
+
+    thread = threading.Thread(target=flush)
+    with pytest.raises(RuntimeError):
+        with task_manager.batch():
+            task_manager.add_task("Отмененная", "Описание", "Работа", "30.01.2025", "высокий")
+            thread.start()
+            # Запись ждет завершения пакета, чтобы не сохранить его незавершенные изменения
+            assert not flushed.wait(0.2)
+            raise RuntimeError("Сбой пакетной операции")
+    thread.join()
+    assert [task.title for task in task_manager.tasks] == ["Сохраненная"]
+    assert [task.title for task in TaskManager(test_file).tasks] == ["Сохраненная"]
+
+
+def test_shared_access(tmp_path):
+    """Тест совместной работы двух экземпляров с одним файлом"""
+    test_file = f"{tmp_path}/test_tasks.json"
+    first_manager = TaskManager(test_file, shared=True)
+    second_manager = TaskManager(test_file, shared=True)
+
+    first = first_manager.add_task(
+        title="Изучить Python",
+        description="Пройти основы языка",
+        category="Обучение",
+        due_date="30.01.2025",
+        priority="высокий"
+    )
+    second = second_manager.add_task(
+        title="Пройти курс Django",
+        description="Изучить основы Django",
+        category="Работа",
+        due_date="20.12.2024",
+        priority="средний"
+    )
+    assert [task.id for task in second_manager.tasks] == [first.id, second.id]
+
+    first_manager.update_status(second.id)
+    assert [task.id for task in first_manager.tasks] == [first.id, second.id]
+    assert [task.status for task in TaskManager(test_file).tasks] == ["не выполнена", "выполнена"]
+
+    # Снимок устаревшего экземпляра записывается только после перечитывания изменений другого
+    second_manager.compact()
+    assert [task.status for task in TaskManager(test_file).tasks] == ["не выполнена", "выполнена"]
+    assert second_manager.get_task(second.id).status == "выполнена"
+
+
+def test_shared_write_behind_merge(tmp_path):
+    """Тест объединения отложенных изменений с изменениями другого процесса"""
+    test_file = f"{tmp_path}/test_tasks.json"
+    first_manager = TaskManager(test_file, shared=True, write_behind=True, max_staleness=60)
+    second_manager = TaskManager(test_file, shared=True)
+
+    counter = Task._counter
+    first = first_manager.add_task(
+        title="Изучить Python",
+        description="Пройти основы языка",
+        category="Обучение",
+        due_date="30.01.2025",
+        priority="высокий"
+    )
+    # Новая задача записывается сразу под блокировкой, и другой процесс не выдает ее ID повторно
+    assert [task.id for task in TaskManager(test_file).tasks] == [first.id]
+    Task._counter = counter
+    second = second_manager.add_task(
+        title="Пройти курс Django",
+        description="Изучить основы Django",
+        category="Работа",
+        due_date="20.12.2024",
+        priority="средний"
+    )
+    assert second.id != first.id
+
+    # Отложенное изменение своей задачи не затрагивает задачу другого процесса
+    first_manager.edit_task(first.id, title="Изучить Python подробно")
+    second_manager.update_status(second.id)
+    first_manager.save_tasks()
+    assert first_manager.refresh()
+    tasks = {task.id: (task.title, task.status) for task in first_manager.tasks}
+    assert tasks == {first.id: ("Изучить Python подробно", "не выполнена"),
+                     second.id: ("Пройти курс Django", "выполнена")}
+    assert {task.id: (task.title, task.status) for task in TaskManager(test_file).tasks} == tasks
+    first_manager.close()
+
+
+def test_thread_safe(tmp_path):
+    """Тест одновременной работы нескольких потоков с одним экземпляром"""
+    test_file = f"{tmp_path}/test_tasks.json"
+    task_manager = TaskManager(test_file, journal=True, thread_safe=True)
+
+    def work(worker):
+        for number in range(25):
+            task = task_manager.add_task(
+                title=f"Задача {worker}-{number}",
+                description="Описание задачи",
+                category=f"Категория {worker % 3}",
+                due_date="30.01.2025",
+                priority="средний"
+            )
+            task_manager.update_status(task.id)
+            task_manager.search_tasks(keyword="задача", category=f"Категория {worker % 3}")
+
+    threads = [threading.Thread(target=work, args=(worker,)) for worker in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    tasks = task_manager.tasks
+    assert len(tasks) == 200
+    assert len({task.id for task in tasks}) == 200
+    assert len(task_manager.get_tasks(status="выполнена")) == 200
+    reloaded = TaskManager(test_file)
+    assert sorted(task.to_dict()["id"] for task in reloaded.tasks) == sorted(task.id for task in tasks)
+    assert all(task.status == "выполнена" for task in reloaded.tasks)
+
+
+def test_write_lines(capsys):
+    """Тест блочного вывода строк, совпадающего с построчным print"""
+    lines = [f"Строка {number}" for number in range(10)]
+    write_lines("Заголовок:", iter(lines), chunk_size=3)
+    output = capsys.readouterr().out
+    print("Заголовок:")
+    for line in lines:
+        print(line)
+    assert output == capsys.readouterr().out
+
+
+def test_pagination(task_manager, capsys):
+    """Тест постраничного вывода задач по курсору"""
+    for number in range(5):
+        task_manager.add_task(
+            title=f"Задача {number}",
+            description="Описание задачи",
+            category="Работа" if number % 2 else "Обучение",
+            due_date="30.01.2025",
+            priority="средний"
+        )
+    capsys.readouterr()
+
+    cursor = task_manager.list_tasks(limit=2)
+    output = capsys.readouterr().out
+    assert "Задача 0" in output and "Задача 1" in output and "Задача 2" not in output
+
+    task_manager.delete_tasks(task_id=task_manager.tasks[2].id)
+    capsys.readouterr()
+    cursor = task_manager.list_tasks(limit=2, cursor=cursor)
+    output = capsys.readouterr().out
+    assert "Задача 3" in output and "Задача 4" in output and "Задача 1" not in output
+    assert cursor is None
+
+    cursor = task_manager.list_tasks(category="обучение", limit=1)
+    assert "Задача 0" in capsys.readouterr().out
+    assert task_manager.list_tasks(category="обучение", limit=1, cursor=cursor) is None
+    assert "Задача 4" in capsys.readouterr().out
+
+    cursor = task_manager.search_tasks(keyword="задача", limit=3)
+    output = capsys.readouterr().out
+    assert "Задача 3" in output and "Задача 4" not in output
+    assert task_manager.search_tasks(keyword="задача", limit=3, cursor=cursor) is None
+    output = capsys.readouterr().out
+    assert "Результаты поиска:" in output and "Задача 4" in output
+
+    with pytest.raises(ValueError):
+        task_manager.list_tasks(limit=2, cursor="страница")
+    with pytest.raises(ValueError):
+        task_manager.list_tasks(limit=0)
+    with pytest.raises(ValueError):
+        task_manager.search_tasks(keyword="задача", limit=-1)
+
+
+def test_query_cache(task_manager, capsys):
+    """Тест кэширования результатов поиска до изменения задач"""
+    task_manager.add_task(
+        title="Изучить Python",
+        description="Пройти основы языка",
+        category="Обучение",
+        due_date="30.01.2025",
+        priority="высокий"
+    )
+    task_manager.search_tasks(category="обучение")
+    task_manager.search_tasks(category="ОБУЧЕНИЕ")
+    assert task_manager.cache_info().hits == 1
+    assert task_manager.cache_info().misses == 1
+
+    task = task_manager.tasks[0]
+    task_manager.edit_task(task.id, category="Работа")
+    capsys.readouterr()
+    task_manager.search_tasks(category="Обучение")
+    assert "Задачи по заданному запросу не найдены" in capsys.readouterr().out
+    assert task_manager.cache_info().misses == 2
+
+    results = task_manager.query(category="работа")
+    results.clear()
+    assert task_manager.query(category="работа") == [task]
+    assert task_manager.cache_info().hits == 2